@@ -13,15 +13,76 @@ This module is configured as an ETSY SEO EXPERT with deep knowledge of:
 """
 
 import os
+import asyncio
+import atexit
 import base64
+import hashlib
 import json
-from groq import Groq
+import re
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+import httpx
+from groq import Groq, AsyncGroq
 from PIL import Image
 import io
 
+from api_compliance import LISTING_CACHE_MAX_AGE_HOURS
+
+try:
+    import pybase64 as _b64  # SIMD-accelerated, API-compatible with base64
+except ImportError:
+    _b64 = base64
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 support in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 # Initialize Groq client
 client = None
 
+# Persistent connection pool shared by all Groq requests
+GROQ_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+GROQ_HTTP_TIMEOUT = 60.0
+
+# Batch fan-out runs on a private event loop thread that owns the async
+# client, so its HTTP pool is reused and callers never need a loop of their own
+_async_loop = None
+_async_client = None
+_async_loop_lock = threading.Lock()
+
+# Markdown code fence around a JSON payload, e.g. ```json ... ```
+_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*(.*?)\s*```\s*$', re.DOTALL | re.IGNORECASE)
+# First JSON array embedded in free-form text
+_JSON_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)
+_JSON_DECODER = json.JSONDecoder()
+
+# Base64 payloads use only the base64 alphabet (plus trailing padding); only
+# this many leading characters are checked, since payloads can be megabytes
+_BASE64_HEAD_RE = re.compile(r'[A-Za-z0-9+/]+={0,2}')
+BASE64_HEAD_CHARS = 64
+
+JPEG_DATA_URL_PREFIX = 'data:image/jpeg;base64,'
+
+# Cache of already-encoded image data URLs keyed by (content hash, max_size)
+ENCODED_IMAGE_CACHE_SIZE = 64
+_encoded_cache = OrderedDict()
+_encoded_cache_lock = threading.Lock()
+
+# On-disk cache of generated listings, shared across processes
+LISTING_CACHE_PATH = os.environ.get(
+    'LISTING_CACHE_PATH', os.path.join(tempfile.gettempdir(), 'listing_cache.sqlite3')
+)
+LISTING_CACHE_MAX_ENTRIES = 1000
+LISTING_PROMPT_VERSION = 1  # Bump when prompts change to invalidate cached listings
+_listing_cache = None
+_listing_cache_lock = threading.Lock()
+
 # =============================================================================
 # ETSY SEO EXPERT SYSTEM PROMPT
 # =============================================================================
@@ -93,6 +154,172 @@ CRITICAL TAG RULES:
 - Include customization options
 - Mention fast shipping/processing
 - Reference positive reviews indirectly"""
+ETSY_EXPERT_SYSTEM_PROMPT = sys.intern(ETSY_EXPERT_SYSTEM_PROMPT)
+
+# Shared system message, sent byte-identical on every call so provider-side
+# prompt prefix caching can hit
+SYSTEM_MESSAGE = {"role": "system", "content": ETSY_EXPERT_SYSTEM_PROMPT}
+
+
+# Per-listing JSON shape and rules shared by all listing generation prompts
+LISTING_SCHEMA_PROMPT = """{
+    "title": "YOUR OPTIMIZED 140-CHAR TITLE HERE",
+    "description": "YOUR FULL DESCRIPTION WITH EMOJIS AND FORMATTING",
+    
+    "listing_attributes": {
+        "holiday": "relevant holiday or null (e.g., Christmas, Valentine's Day, Mother's Day, Halloween)",
+        "occasion": "primary occasion or null (e.g., Birthday, Wedding, Anniversary, Graduation)",
+        "recipient": "target recipient or null (e.g., For Her, For Him, For Kids, For Mom, For Teacher)",
+        "subject": "main subject/theme or null (e.g., Nature, Animals, Abstract, Typography)",
+        "style": ["style1", "style2"],
+        "primary_color": "main color or null (e.g., Black, White, Blue, Pink, Gold)",
+        "secondary_color": "secondary color or null",
+        "mood": "emotional feeling or null (e.g., Joyful, Calm, Romantic, Inspirational, Fun)"
+    },
+    "tags": ["tag1", "tag2", ... exactly 13 tags],
+    "category": "Primary Category > Subcategory > Specific",
+    "primary_keywords": ["top", "3", "keywords"],
+    "long_tail_phrases": ["specific phrase buyers search", "another long tail"],
+    "target_buyer": "Description of ideal buyer persona",
+    "seasonal_relevance": ["relevant seasons or occasions"]
+}
+
+CRITICAL REQUIREMENTS:
+✅ Title: Front-load with highest-value keyword, use full 140 characters
+✅ Tags: Exactly 13 unique multi-word phrases, no single words, no title repeats
+✅ Description: Hook in first 160 chars, use emojis, bullet points, answer FAQs
+✅ Listing Attributes: Fill in holiday, occasion, recipient, subject, style, colors, mood based on the image
+✅ Think like the BUYER - what would they type in Etsy search?
+
+IMPORTANT FOR listing_attributes:
+- Only fill fields that genuinely apply to this product
+- Use null for fields that don't apply
+- style array should have 1-2 descriptive style terms
+- Colors should match actual colors visible in the image/product
+- Mood should reflect the emotional feeling the product evokes"""
+
+# Prompt templates for batch listing generation, filled with str.format per call
+BATCH_INTRO_TEMPLATE = """Analyze the following {count} product image(s) and create a PERFECTLY OPTIMIZED
+Etsy listing for EACH one that will RANK HIGH in search and CONVERT browsers into buyers."""
+
+BATCH_INSTRUCTIONS_TEMPLATE = (
+    "Apply ALL your Etsy SEO expertise to generate one listing object per product:\n\n"
+    + LISTING_SCHEMA_PROMPT.replace('{', '{{').replace('}', '}}')
+    + """
+
+Respond with ONLY valid JSON of the form {{"listings": [...]}} containing exactly {count}
+listing object(s), one per product, in the same order as the products above.
+No markdown, no explanation."""
+)
+
+# Prompt templates for regenerate_field, filled with str.format per call
+FIELD_PROMPT_TEMPLATES = {
+    'title': """As an Etsy SEO expert, create a NEW highly-optimized title for this product.
+
+CURRENT TITLE: {title}
+CURRENT TAGS: {tags}
+
+{request}
+
+TITLE OPTIMIZATION CHECKLIST:
+✅ Front-load with primary keyword (first 40 chars are crucial)
+✅ Include 2-3 keyword phrases separated by | or -
+✅ Add gift/occasion terms if applicable
+✅ Use ALL 140 characters strategically
+✅ No filler words (cute, nice, great)
+✅ No repeated words
+✅ Natural, readable flow
+
+Respond with ONLY the new title, nothing else.""",
+
+    'description': """As an Etsy SEO expert, write a NEW high-converting product description.
+
+CURRENT DESCRIPTION:
+{description}
+
+PRODUCT TITLE: {title}
+
+{request}
+
+DESCRIPTION MUST INCLUDE:
+✅ Hook in first 160 characters (appears in search results!)
+✅ Emoji-enhanced headers for scannability
+✅ "What's Included" section with bullet points
+✅ Benefits & use cases
+✅ Gift-giving suggestions
+✅ FAQ answers (size, materials, delivery)
+✅ Strong call-to-action
+✅ Natural keyword integration (not stuffing!)
+
+Respond with ONLY the new description.""",
+
+    'tags': """As an Etsy SEO expert, generate 13 NEW perfectly-optimized tags.
+
+CURRENT TAGS: {tags}
+PRODUCT TITLE: {title}
+
+{request}
+
+TAG STRATEGY:
+• Tags 1-3: Primary product keywords (exact match searches)
+• Tags 4-6: Long-tail descriptive phrases
+• Tags 7-9: Gift/occasion keywords
+• Tags 10-11: Style/aesthetic keywords
+• Tags 12-13: Material/technique keywords
+
+TAG RULES:
+✅ Each tag max 20 characters
+✅ Multi-word phrases, not single words
+✅ No words already in title (Etsy indexes separately)
+✅ Include synonyms buyers might search
+✅ Mix high-volume and niche terms
+
+Respond with ONLY a JSON array of exactly 13 tags."""
+}
+
+# Used in place of {request} when no custom instruction is given
+FIELD_DEFAULT_REQUESTS = {
+    'title': 'Make it rank higher and convert better.',
+    'description': 'Optimize for both SEO and conversion.',
+    'tags': 'Maximize search visibility with strategic tag selection.'
+}
+
+# Batching limits for generate_listing_content_batch
+MAX_BATCH_IMAGES = 20
+LISTING_OUTPUT_TOKENS = 2500  # Completion budget per generated listing
+IMAGE_TOKEN_ESTIMATE = 1600  # Approximate prompt tokens per image
+BATCH_TOKEN_BUDGET = 10000  # Keep prompt + completion well inside the context window
+
+# Maximum Groq requests in flight at once for concurrent generation
+GROQ_MAX_CONCURRENT_REQUESTS = 5
+
+# Field regeneration budgets: SEO text fields don't need full-resolution
+# pixels, so images are sent at 512px / low detail, and title/tag
+# regeneration is text-only when a description is available
+REGENERATE_IMAGE_MAX_SIZE = 512
+TEXT_ONLY_FIELDS = ('title', 'tags')
+
+# Seasonal keyword suggestions, indexed by month - 1
+SEASONAL_KEYWORDS = (
+    ("new year", "organization", "planner", "resolution", "fresh start", "winter decor"),
+    ("valentine", "love gift", "romantic", "galentine", "heart design", "couples gift"),
+    ("spring decor", "easter", "st patrick", "spring cleaning", "pastel", "floral"),
+    ("easter gift", "spring wedding", "earth day", "garden", "mother day early"),
+    ("mother day", "mom gift", "graduation", "teacher appreciation", "memorial day"),
+    ("father day", "dad gift", "summer", "wedding season", "graduation gift"),
+    ("summer decor", "fourth july", "patriotic", "beach", "vacation", "outdoor"),
+    ("back to school", "teacher gift", "dorm decor", "fall prep", "organize"),
+    ("fall decor", "autumn", "pumpkin spice", "labor day", "back to school"),
+    ("halloween", "spooky", "fall gift", "thanksgiving prep", "harvest"),
+    ("thanksgiving", "black friday", "christmas early", "holiday gift", "gratitude"),
+    ("christmas gift", "holiday", "hanukkah", "new year eve", "winter", "stocking stuffer"),
+)
+EVERGREEN_KEYWORDS = ("evergreen", "gift idea", "handmade")
+
+# Filler tags for padding to 13; twice as many as needed so a collision
+# with a model-provided tag can still be skipped
+PAD_TAGS = tuple(f"handmade gift {i}" for i in range(26))
+PAD_TAGS_ITEM = tuple(f"handmade item {i}" for i in range(26))
 
 
 def init_groq():
@@ -100,10 +327,28 @@ def init_groq():
     global client
     api_key = os.environ.get('GROQ_API_KEY')
     if api_key:
-        client = Groq(api_key=api_key)
+        http_client = httpx.Client(
+            http2=HTTP2_AVAILABLE,
+            limits=GROQ_HTTP_LIMITS,
+            timeout=GROQ_HTTP_TIMEOUT
+        )
+        client = Groq(api_key=api_key, http_client=http_client)
+        atexit.register(client.close)
     return client is not None
 
 
+def _is_base64_blob(image_data: str) -> bool:
+    """
+    Tell a base64 image payload (any format) apart from a file path.
+    
+    Paths to real images usually have an extension, which is outside the
+    base64 alphabet. An existing file always counts as a path, which covers
+    bare relative names like 'photos/mug'.
+    """
+    return (_BASE64_HEAD_RE.fullmatch(image_data, 0, BASE64_HEAD_CHARS) is not None
+            and not os.path.exists(image_data))
+
+
 def encode_image_to_base64(image_path: str, max_size: int = 1024) -> str:
     """
     Encode image to base64, resizing if needed to reduce token usage.
@@ -115,18 +360,7 @@ def encode_image_to_base64(image_path: str, max_size: int = 1024) -> str:
     Returns:
         Base64 encoded string
     """
-    with Image.open(image_path) as img:
-        if img.mode in ('RGBA', 'P'):
-            img = img.convert('RGB')
-        
-        if max(img.size) > max_size:
-            ratio = max_size / max(img.size)
-            new_size = tuple(int(dim * ratio) for dim in img.size)
-            img = img.resize(new_size, Image.Resampling.LANCZOS)
-        
-        buffer = io.BytesIO()
-        img.save(buffer, format='JPEG', quality=85)
-        return base64.standard_b64encode(buffer.getvalue()).decode('utf-8')
+    return encode_image_to_data_url(image_path, max_size)[len(JPEG_DATA_URL_PREFIX):]
 
 
 def encode_image_bytes_to_base64(image_bytes: bytes, max_size: int = 1024) -> str:
@@ -140,7 +374,66 @@ def encode_image_bytes_to_base64(image_bytes: bytes, max_size: int = 1024) -> st
     Returns:
         Base64 encoded string
     """
+    return encode_image_bytes_to_data_url(image_bytes, max_size)[len(JPEG_DATA_URL_PREFIX):]
+
+
+def encode_image_to_data_url(image_path: str, max_size: int = 1024) -> str:
+    """
+    Encode an image file as a JPEG data URL ready for an image_url part.
+    
+    Args:
+        image_path: Path to the image file
+        max_size: Maximum dimension (width or height)
+    
+    Returns:
+        data:image/jpeg;base64,... string
+    """
+    with open(image_path, 'rb') as f:
+        image_bytes = f.read()
+    return encode_image_bytes_to_data_url(image_bytes, max_size)
+
+
+def encode_image_bytes_to_data_url(image_bytes: bytes, max_size: int = 1024) -> str:
+    """
+    Encode image bytes as a JPEG data URL, resizing if needed.
+    
+    Results are cached by content hash, so re-sending the same image
+    (e.g. when regenerating several fields) skips the PIL work and reuses
+    the same data URL string.
+    
+    Args:
+        image_bytes: Raw image bytes
+        max_size: Maximum dimension
+    
+    Returns:
+        data:image/jpeg;base64,... string
+    """
+    key = (hashlib.blake2b(image_bytes, digest_size=16).digest(), max_size)
+    
+    with _encoded_cache_lock:
+        cached = _encoded_cache.get(key)
+        if cached is not None:
+            _encoded_cache.move_to_end(key)
+            return cached
+    
+    data_url = _resize_and_encode(image_bytes, max_size)
+    
+    with _encoded_cache_lock:
+        _encoded_cache[key] = data_url
+        _encoded_cache.move_to_end(key)
+        while len(_encoded_cache) > ENCODED_IMAGE_CACHE_SIZE:
+            _encoded_cache.popitem(last=False)
+    
+    return data_url
+
+
+def _resize_and_encode(image_bytes: bytes, max_size: int) -> str:
+    """Decode, downscale and re-encode an image as a JPEG data URL"""
     with Image.open(io.BytesIO(image_bytes)) as img:
+        # Let libjpeg downscale during DCT decode (no-op for non-JPEG sources)
+        img.draft('RGB', (max_size, max_size))
+        img.load()
+        
         if img.mode in ('RGBA', 'P'):
             img = img.convert('RGB')
         
@@ -149,177 +442,208 @@ def encode_image_bytes_to_base64(image_bytes: bytes, max_size: int = 1024) -> st
             new_size = tuple(int(dim * ratio) for dim in img.size)
             img = img.resize(new_size, Image.Resampling.LANCZOS)
         
-        buffer = io.BytesIO()
-        img.save(buffer, format='JPEG', quality=85)
-        return base64.standard_b64encode(buffer.getvalue()).decode('utf-8')
+        with io.BytesIO() as buffer:
+            img.save(buffer, format='JPEG', quality=85, optimize=False, progressive=False)
+            # Encode straight from the buffer's memory instead of a getvalue() copy
+            with buffer.getbuffer() as view:
+                return JPEG_DATA_URL_PREFIX + _b64.standard_b64encode(view).decode('ascii')
 
 
-def generate_listing_content(image_data: str, folder_name: str = None,
-                            image_count: int = 1, category_hint: str = None) -> dict:
-    """
-    Generate optimized Etsy listing content using Groq Vision AI with expert SEO knowledge.
+def _get_listing_cache():
+    """Get or create the SQLite connection backing the listing cache"""
+    global _listing_cache
+    if _listing_cache is None:
+        _listing_cache = sqlite3.connect(LISTING_CACHE_PATH, timeout=5, check_same_thread=False)
+        _listing_cache.execute(
+            'CREATE TABLE IF NOT EXISTS listings ('
+            'key TEXT PRIMARY KEY, result TEXT NOT NULL, '
+            'created_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+        )
+        _listing_cache.commit()
+    return _listing_cache
+
+
+def _listing_cache_key(item: dict) -> str:
+    """Cache key from image content, prompt context and prompt version"""
+    image_data = item['image_data']
+    if isinstance(image_data, (bytes, bytearray)):
+        image_bytes = image_data
+    elif _is_base64_blob(image_data):
+        image_bytes = image_data.encode('ascii')
+    else:
+        with open(image_data, 'rb') as f:
+            image_bytes = f.read()
     
-    Args:
-        image_data: Base64 encoded image or file path
-        folder_name: Name of the product folder (provides context)
-        image_count: Number of images/variations in the product
-        category_hint: Suggested category (optional)
+    return json.dumps([
+        hashlib.blake2b(image_bytes, digest_size=16).hexdigest(),
+        item.get('folder_name'),
+        item.get('category_hint'),
+        item.get('image_count', 1),
+        LISTING_PROMPT_VERSION
+    ])
+
+
+def _listing_cache_get(key: str):
+    """Return a cached listing, or None if missing or older than the max age"""
+    now = time.time()
+    try:
+        with _listing_cache_lock:
+            conn = _get_listing_cache()
+            row = conn.execute(
+                'SELECT result FROM listings WHERE key = ? AND created_at > ?',
+                (key, now - LISTING_CACHE_MAX_AGE_HOURS * 3600)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute('UPDATE listings SET accessed_at = ? WHERE key = ?', (now, key))
+            conn.commit()
+    except sqlite3.Error:
+        # The cache is an optimization only; treat failures as a miss
+        return None
     
-    Returns:
-        Dictionary with title, description, tags, category, style, and keyword insights
-    """
-    global client
+    return json.loads(row[0])
+
+
+def _listing_cache_set(key: str, result: dict):
+    """Store a generated listing and evict expired / least recently used entries"""
+    now = time.time()
+    try:
+        with _listing_cache_lock:
+            conn = _get_listing_cache()
+            conn.execute(
+                'INSERT OR REPLACE INTO listings (key, result, created_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, json.dumps(result), now, now)
+            )
+            conn.execute(
+                'DELETE FROM listings WHERE created_at <= ?',
+                (now - LISTING_CACHE_MAX_AGE_HOURS * 3600,)
+            )
+            conn.execute(
+                'DELETE FROM listings WHERE key NOT IN '
+                '(SELECT key FROM listings ORDER BY accessed_at DESC LIMIT ?)',
+                (LISTING_CACHE_MAX_ENTRIES,)
+            )
+            conn.commit()
+    except sqlite3.Error:
+        pass
+
+
+def _lookup_cached_listings(images: list) -> tuple:
+    """Return (cache keys, cached listing or None) for each item"""
+    keys = [_listing_cache_key(item) for item in images]
+    return keys, [_listing_cache_get(key) for key in keys]
+
+
+def _build_listing_context(item: dict) -> str:
+    """Build the per-product context lines for a listing prompt"""
+    context_parts = []
+    if item.get('folder_name'):
+        context_parts.append(f"📁 Product folder name: {item['folder_name']}")
+    if item.get('category_hint'):
+        context_parts.append(f"📂 Suggested category: {item['category_hint']}")
+    context_parts.append(f"🖼️ This listing includes {item.get('image_count', 1)} image variation(s)")
     
-    if not client:
-        if not init_groq():
-            raise ValueError("Groq API key not configured")
+    return "\n".join(context_parts)
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token)"""
+    return len(text) // 4
+
+
+def _pack_batches(items: list) -> list:
+    """Split items into batches that fit the per-request token budget"""
+    base_tokens = _estimate_tokens(ETSY_EXPERT_SYSTEM_PROMPT) + _estimate_tokens(LISTING_SCHEMA_PROMPT)
     
-    # If it's a file path, encode it
-    if not image_data.startswith('/9j/') and not image_data.startswith('iVBOR'):
-        image_data = encode_image_to_base64(image_data)
+    batches = []
+    current = []
+    current_tokens = base_tokens
     
-    # Build context
-    context_parts = []
-    if folder_name:
-        context_parts.append(f"📁 Product folder name: {folder_name}")
-    if category_hint:
-        context_parts.append(f"📂 Suggested category: {category_hint}")
-    context_parts.append(f"🖼️ This listing includes {image_count} image variation(s)")
+    for item in items:
+        item_tokens = (LISTING_OUTPUT_TOKENS + IMAGE_TOKEN_ESTIMATE +
+                       _estimate_tokens(_build_listing_context(item)))
+        if current and (len(current) >= MAX_BATCH_IMAGES or
+                        current_tokens + item_tokens > BATCH_TOKEN_BUDGET):
+            batches.append(current)
+            current = []
+            current_tokens = base_tokens
+        current.append(item)
+        current_tokens += item_tokens
     
-    context = "\n".join(context_parts)
+    if current:
+        batches.append(current)
     
-    user_prompt = f"""Analyze this product image and create a PERFECTLY OPTIMIZED Etsy listing 
-that will RANK HIGH in search and CONVERT browsers into buyers.
-
-{context}
+    return batches
 
-Apply ALL your Etsy SEO expertise to generate:
 
-{{
-    "title": "YOUR OPTIMIZED 140-CHAR TITLE HERE",
-    "description": "YOUR FULL DESCRIPTION WITH EMOJIS AND FORMATTING",
+def _clean_tags(tags: list, pad_tags: tuple) -> list:
+    """
+    Truncate, lowercase and dedupe tags in a single pass, padding to 13.
     
-    "listing_attributes": {{
-        "holiday": "relevant holiday or null (e.g., Christmas, Valentine's Day, Mother's Day, Halloween)",
-        "occasion": "primary occasion or null (e.g., Birthday, Wedding, Anniversary, Graduation)",
-        "recipient": "target recipient or null (e.g., For Her, For Him, For Kids, For Mom, For Teacher)",
-        "subject": "main subject/theme or null (e.g., Nature, Animals, Abstract, Typography)",
-        "style": ["style1", "style2"],
-        "primary_color": "main color or null (e.g., Black, White, Blue, Pink, Gold)",
-        "secondary_color": "secondary color or null",
-        "mood": "emotional feeling or null (e.g., Joyful, Calm, Romantic, Inspirational, Fun)"
-    }},
-    "tags": ["tag1", "tag2", ... exactly 13 tags],
-    "category": "Primary Category > Subcategory > Specific",
-    "primary_keywords": ["top", "3", "keywords"],
-    "long_tail_phrases": ["specific phrase buyers search", "another long tail"],
-    "target_buyer": "Description of ideal buyer persona",
-    "seasonal_relevance": ["relevant seasons or occasions"]
-}}
+    Args:
+        tags: Raw tags from the model
+        pad_tags: Precomputed filler tags used when fewer than 13 remain
+    
+    Returns:
+        Exactly 13 unique tags of max 20 characters
+    """
+    seen = {}  # Insertion-ordered set
+    for tag in tags[:13]:
+        tag = tag[:20].lower()
+        if tag and tag not in seen:
+            seen[tag] = None
+    
+    if len(seen) < 13:
+        for pad_tag in pad_tags[len(seen):]:
+            if pad_tag not in seen:
+                seen[pad_tag] = None
+                if len(seen) == 13:
+                    break
+    
+    return list(seen)
 
-CRITICAL REQUIREMENTS:
-✅ Title: Front-load with highest-value keyword, use full 140 characters
-✅ Tags: Exactly 13 unique multi-word phrases, no single words, no title repeats
-✅ Description: Hook in first 160 chars, use emojis, bullet points, answer FAQs
-✅ Listing Attributes: Fill in holiday, occasion, recipient, subject, style, colors, mood based on the image
-✅ Think like the BUYER - what would they type in Etsy search?
 
-IMPORTANT FOR listing_attributes:
-- Only fill fields that genuinely apply to this product
-- Use null for fields that don't apply
-- style array should have 1-2 descriptive style terms
-- Colors should match actual colors visible in the image/product
-- Mood should reflect the emotional feeling the product evokes
+def _normalize_listing_result(result: dict) -> dict:
+    """Enforce Etsy limits on tags, title and listing_attributes"""
+    # Validate and fix tags
+    if 'tags' in result:
+        result['tags'] = _clean_tags(result['tags'], PAD_TAGS)
+    
+    # Ensure title is max 140 chars
+    if 'title' in result and len(result['title']) > 140:
+        result['title'] = result['title'][:137] + '...'
+    
+    # Ensure listing_attributes exists with proper structure
+    if 'listing_attributes' not in result:
+        result['listing_attributes'] = {
+            'holiday': None,
+            'occasion': None,
+            'recipient': None,
+            'subject': None,
+            'style': [],
+            'primary_color': None,
+            'secondary_color': None,
+            'mood': None
+        }
+    else:
+        # Validate listing_attributes structure
+        attrs = result['listing_attributes']
+        # Ensure style is a list
+        if 'style' in attrs and not isinstance(attrs['style'], list):
+            attrs['style'] = [attrs['style']] if attrs['style'] else []
+        # Limit styles to max 2
+        if 'style' in attrs:
+            attrs['style'] = attrs['style'][:2]
+    
+    return result
 
-Respond with ONLY valid JSON. No markdown, no explanation."""
 
-    try:
-        response = client.chat.completions.create(
-            model="llama-3.2-90b-vision-preview",
-            messages=[
-                {
-                    "role": "system",
-                    "content": ETSY_EXPERT_SYSTEM_PROMPT
-                },
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": user_prompt},
-                        {
-                            "type": "image_url",
-                            "image_url": {"url": f"data:image/jpeg;base64,{image_data}"}
-                        }
-                    ]
-                }
-            ],
-            max_tokens=2500,
-            temperature=0.7
-        )
-        
-        content = response.choices[0].message.content.strip()
-        
-        # Handle potential markdown code blocks
-        if content.startswith('```'):
-            content = content.split('```')[1]
-            if content.startswith('json'):
-                content = content[4:]
-        
-        result = json.loads(content)
-        
-        # Validate and fix tags
-        if 'tags' in result:
-            # Ensure exactly 13 tags
-            tags = result['tags'][:13]
-            # Ensure each tag is max 20 characters
-            tags = [tag[:20] if len(tag) > 20 else tag for tag in tags]
-            # Ensure lowercase
-            tags = [tag.lower() for tag in tags]
-            # Remove duplicates while preserving order
-            seen = set()
-            unique_tags = []
-            for tag in tags:
-                if tag not in seen:
-                    seen.add(tag)
-                    unique_tags.append(tag)
-            # Pad to 13 if needed
-            while len(unique_tags) < 13:
-                unique_tags.append(f"handmade gift {len(unique_tags)}")
-            result['tags'] = unique_tags[:13]
-        
-        # Ensure title is max 140 chars
-        if 'title' in result and len(result['title']) > 140:
-            result['title'] = result['title'][:137] + '...'
-        
-        # Ensure listing_attributes exists with proper structure
-        if 'listing_attributes' not in result:
-            result['listing_attributes'] = {
-                'holiday': None,
-                'occasion': None,
-                'recipient': None,
-                'subject': None,
-                'style': [],
-                'primary_color': None,
-                'secondary_color': None,
-                'mood': None
-            }
-        else:
-            # Validate listing_attributes structure
-            attrs = result['listing_attributes']
-            # Ensure style is a list
-            if 'style' in attrs and not isinstance(attrs['style'], list):
-                attrs['style'] = [attrs['style']] if attrs['style'] else []
-            # Limit styles to max 2
-            if 'style' in attrs:
-                attrs['style'] = attrs['style'][:2]
-        
-        return result
-        
-    except json.JSONDecodeError as e:
-        # Enhanced fallback with SEO-optimized defaults
-        product_name = folder_name or "Premium Digital Product"
-        return {
-            'title': f'{product_name} | Instant Digital Download | Commercial Use License | Printable Design Template',
-            'description': f'''✨ {product_name.upper()} - INSTANT DOWNLOAD ✨
+def _fallback_listing_content(folder_name: str, image_count: int, error: str) -> dict:
+    """SEO-optimized default listing used when the AI response can't be parsed"""
+    product_name = folder_name or "Premium Digital Product"
+    return {
+        'title': f'{product_name} | Instant Digital Download | Commercial Use License | Printable Design Template',
+        'description': f'''✨ {product_name.upper()} - INSTANT DOWNLOAD ✨
 
 Transform your creative projects with this professionally designed digital product!
 
@@ -350,148 +674,435 @@ Download immediately after purchase - no waiting!
 Message us anytime - we're here to help!
 
 ⭐ Don't forget to favorite our shop for new releases!''',
-            'tags': [
-                'digital download',
-                'instant download',
-                'commercial use',
-                'printable design',
-                'small business',
-                'craft supplies',
-                'diy project',
-                'creative template',
-                'print on demand',
-                'handmade gift idea',
-                'entrepreneur tools',
-                'digital product',
-                'instant access file'
-            ],
-            'category': 'Digital Downloads > Graphics',
-            'listing_attributes': {
-                'holiday': None,
-                'occasion': None,
-                'recipient': None,
-                'subject': None,
-                'style': ['Modern'],
-                'primary_color': None,
-                'secondary_color': None,
-                'mood': None
-            },
-            'primary_keywords': ['digital download', 'instant download', 'commercial use'],
-            'long_tail_phrases': ['instant digital download for commercial use', 'printable design template'],
-            'target_buyer': 'Creative entrepreneurs and small business owners',
-            'seasonal_relevance': ['year-round', 'small business saturday'],
-            'error': f'AI parsing failed, using optimized fallback: {str(e)}'
-        }
-        
-    except Exception as e:
-        raise Exception(f"Groq API error: {str(e)}")
+        'tags': [
+            'digital download',
+            'instant download',
+            'commercial use',
+            'printable design',
+            'small business',
+            'craft supplies',
+            'diy project',
+            'creative template',
+            'print on demand',
+            'handmade gift idea',
+            'entrepreneur tools',
+            'digital product',
+            'instant access file'
+        ],
+        'category': 'Digital Downloads > Graphics',
+        'listing_attributes': {
+            'holiday': None,
+            'occasion': None,
+            'recipient': None,
+            'subject': None,
+            'style': ['Modern'],
+            'primary_color': None,
+            'secondary_color': None,
+            'mood': None
+        },
+        'primary_keywords': ['digital download', 'instant download', 'commercial use'],
+        'long_tail_phrases': ['instant digital download for commercial use', 'printable design template'],
+        'target_buyer': 'Creative entrepreneurs and small business owners',
+        'seasonal_relevance': ['year-round', 'small business saturday'],
+        'error': f'AI parsing failed, using optimized fallback: {error}'
+    }
 
 
-def regenerate_field(image_data: str, field: str, current_content: dict,
-                     instruction: str = None) -> str:
+def _loads_json(content: str):
     """
-    Regenerate a specific field with expert-level Etsy SEO optimization.
+    Parse a JSON response, tolerating a surrounding markdown code fence.
+    
+    JSON mode makes the fence rare, so it is only stripped after a
+    direct parse fails.
+    """
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        match = _FENCE_RE.match(content)
+        if not match:
+            raise
+        return json.loads(match.group(1))
+
+
+def _salvage_listings(content: str) -> list:
+    """
+    Decode the complete objects at the start of a malformed listings array.
+    
+    Used when the response was cut off (e.g. at max_tokens): listings before
+    the first broken object are kept and the rest are left for the fallback.
+    """
+    start = content.find('[')
+    if start == -1:
+        return []
+    
+    listings = []
+    pos = start + 1
+    while True:
+        while pos < len(content) and content[pos] in ' \t\r\n,':
+            pos += 1
+        if pos >= len(content) or content[pos] != '{':
+            break
+        try:
+            listing, pos = _JSON_DECODER.raw_decode(content, pos)
+        except json.JSONDecodeError:
+            break
+        listings.append(listing)
+    return listings
+
+
+def _parse_batch_response(content: str, expected: int) -> list:
+    """
+    Parse a batch response into one listing dict per product.
+    
+    Items that can't be recovered are returned as None.
+    """
+    try:
+        parsed = _loads_json(content)
+    except json.JSONDecodeError:
+        parsed = _salvage_listings(content)
+    
+    if isinstance(parsed, dict):
+        parsed = parsed['listings'] if isinstance(parsed.get('listings'), list) else [parsed]
+    elif not isinstance(parsed, list):
+        parsed = []
+    
+    results = [item if isinstance(item, dict) else None for item in parsed[:expected]]
+    results.extend([None] * (expected - len(results)))
+    return results
+
+
+def generate_listing_content_batch(images: list) -> list:
+    """
+    Generate optimized Etsy listing content for several products at once.
+    
+    Products are packed into as few Groq vision calls as the token budget
+    allows, sharing the system prompt and request overhead. A single batch
+    goes through the shared sync client; several batches are sent
+    concurrently on the private event loop (see generate_many).
     
     Args:
-        image_data: Base64 encoded image
-        field: Field to regenerate (title, description, tags)
-        current_content: Current listing content for context
-        instruction: Custom instruction for regeneration
+        images: List of dicts with keys:
+            - image_data: Raw image bytes, base64 encoded image or file path
+            - folder_name: Name of the product folder (optional)
+            - image_count: Number of images/variations (optional, default 1)
+            - category_hint: Suggested category (optional)
     
     Returns:
-        New optimized value for the field
+        List of listing dicts in the same order as the input
     """
+    keys, results = _lookup_cached_listings(images)
+    misses = [i for i, result in enumerate(results) if result is None]
+    if not misses:
+        return results
+    
+    batches = _pack_batches([images[i] for i in misses])
+    if len(batches) == 1:
+        batch_results = [_generate_batch(batches[0])]
+    else:
+        batch_results = asyncio.run_coroutine_threadsafe(
+            _agenerate_batches(batches), _get_async_loop()
+        ).result()
+    
+    _store_generated(results, keys, misses, batch_results)
+    return results
+
+
+async def generate_many(images: list) -> list:
+    """
+    Async variant of generate_listing_content_batch.
+    
+    Previously generated listings are served from the on-disk listing cache;
+    the remaining products are packed into batches that are sent
+    concurrently, with at most GROQ_MAX_CONCURRENT_REQUESTS requests in flight.
+    
+    Args:
+        images: Same item dicts as generate_listing_content_batch
+    
+    Returns:
+        List of listing dicts in the same order as the input
+    """
+    keys, results = await asyncio.to_thread(_lookup_cached_listings, images)
+    misses = [i for i, result in enumerate(results) if result is None]
+    if not misses:
+        return results
+    
+    batches = _pack_batches([images[i] for i in misses])
+    batch_results = await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(
+        _agenerate_batches(batches), _get_async_loop()
+    ))
+    
+    await asyncio.to_thread(_store_generated, results, keys, misses, batch_results)
+    return results
+
+
+async def agenerate_listing_content(image_data: str, folder_name: str = None,
+                                    image_count: int = 1, category_hint: str = None) -> dict:
+    """Async variant of generate_listing_content"""
+    results = await generate_many([{
+        'image_data': image_data,
+        'folder_name': folder_name,
+        'image_count': image_count,
+        'category_hint': category_hint
+    }])
+    return results[0]
+
+
+def _store_generated(results: list, keys: list, misses: list, batch_results: list):
+    """Fill the cache misses in results with generated listings and cache them"""
+    generated = [listing for batch in batch_results for listing in batch]
+    for i, listing in zip(misses, generated):
+        results[i] = listing
+        # Don't cache fallback content, so the next attempt retries the AI
+        if 'error' not in listing:
+            _listing_cache_set(keys[i], listing)
+
+
+def _get_async_loop():
+    """Return the private event loop, starting its daemon thread on first use"""
+    global _async_loop
+    
+    with _async_loop_lock:
+        if _async_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='groq-async', daemon=True).start()
+            _async_loop = loop
+    return _async_loop
+
+
+def _get_async_client():
+    """Return the shared AsyncGroq client; only called on the private loop"""
+    global _async_client
+    
+    if _async_client is None:
+        api_key = os.environ.get('GROQ_API_KEY')
+        if not api_key:
+            raise ValueError("Groq API key not configured")
+        http_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=GROQ_HTTP_LIMITS,
+            timeout=GROQ_HTTP_TIMEOUT
+        )
+        _async_client = AsyncGroq(api_key=api_key, http_client=http_client)
+    return _async_client
+
+
+async def _agenerate_batches(batches: list) -> list:
+    """Send packed batches concurrently, at most GROQ_MAX_CONCURRENT_REQUESTS at a time"""
+    aclient = _get_async_client()
+    semaphore = asyncio.Semaphore(GROQ_MAX_CONCURRENT_REQUESTS)
+    return await asyncio.gather(*(
+        _agenerate_batch(aclient, semaphore, batch) for batch in batches
+    ))
+
+
+def _generate_batch(items: list) -> list:
+    """Run a single Groq vision call for a packed batch on the shared sync client"""
     global client
     
     if not client:
         if not init_groq():
             raise ValueError("Groq API key not configured")
     
-    field_prompts = {
-        'title': f"""As an Etsy SEO expert, create a NEW highly-optimized title for this product.
+    request = _build_batch_request(items)
+    try:
+        response = client.chat.completions.create(**request)
+        content = response.choices[0].message.content.strip()
+    except Exception as e:
+        raise Exception(f"Groq API error: {str(e)}")
+    
+    return _process_batch_response(items, content)
 
-CURRENT TITLE: {current_content.get('title', '')}
-CURRENT TAGS: {', '.join(current_content.get('tags', []))}
 
-{f'SPECIFIC REQUEST: {instruction}' if instruction else 'Make it rank higher and convert better.'}
+async def _agenerate_batch(aclient, semaphore, items: list) -> list:
+    """Run a single Groq vision call for a packed batch of products"""
+    # Image decoding/resizing is CPU-bound; keep it off the event loop
+    request = await asyncio.to_thread(_build_batch_request, items)
+    
+    async with semaphore:
+        try:
+            response = await aclient.chat.completions.create(**request)
+            content = response.choices[0].message.content.strip()
+        except Exception as e:
+            raise Exception(f"Groq API error: {str(e)}")
+    
+    return _process_batch_response(items, content)
 
-TITLE OPTIMIZATION CHECKLIST:
-✅ Front-load with primary keyword (first 40 chars are crucial)
-✅ Include 2-3 keyword phrases separated by | or -
-✅ Add gift/occasion terms if applicable
-✅ Use ALL 140 characters strategically
-✅ No filler words (cute, nice, great)
-✅ No repeated words
-✅ Natural, readable flow
 
-Respond with ONLY the new title, nothing else.""",
+def _build_batch_request(items: list) -> dict:
+    """Build the chat completion arguments for a packed batch of products"""
+    count = len(items)
+    
+    content_parts = [{"type": "text", "text": BATCH_INTRO_TEMPLATE.format(count=count)}]
+    
+    for index, item in enumerate(items, start=1):
+        image_data = item['image_data']
+        # Raw upload bytes go straight to the resize cache; file paths are read and encoded
+        if isinstance(image_data, (bytes, bytearray)):
+            image_url = encode_image_bytes_to_data_url(image_data)
+        elif _is_base64_blob(image_data):
+            image_url = JPEG_DATA_URL_PREFIX + image_data
+        else:
+            image_url = encode_image_to_data_url(image_data)
+        
+        content_parts.append({"type": "text", "text": f"PRODUCT {index}:\n{_build_listing_context(item)}"})
+        content_parts.append({
+            "type": "image_url",
+            "image_url": {"url": image_url}
+        })
+    
+    content_parts.append({"type": "text", "text": BATCH_INSTRUCTIONS_TEMPLATE.format(count=count)})
+    
+    return {
+        'model': "llama-3.2-90b-vision-preview",
+        'messages': [
+            SYSTEM_MESSAGE,
+            {
+                "role": "user",
+                "content": content_parts
+            }
+        ],
+        'max_tokens': LISTING_OUTPUT_TOKENS * count,
+        'temperature': 0.7,
+        'response_format': {"type": "json_object"}
+    }
 
-        'description': f"""As an Etsy SEO expert, write a NEW high-converting product description.
 
-CURRENT DESCRIPTION:
-{current_content.get('description', '')}
+def _process_batch_response(items: list, content: str) -> list:
+    """Normalize each parsed listing, substituting the fallback for missing ones"""
+    results = []
+    for item, result in zip(items, _parse_batch_response(content, len(items))):
+        if result is None:
+            result = _fallback_listing_content(
+                item.get('folder_name'), item.get('image_count', 1),
+                'response did not contain a valid listing for this product'
+            )
+        else:
+            result = _normalize_listing_result(result)
+        results.append(result)
+    
+    return results
 
-PRODUCT TITLE: {current_content.get('title', '')}
 
-{f'SPECIFIC REQUEST: {instruction}' if instruction else 'Optimize for both SEO and conversion.'}
+def generate_listing_content(image_data: str, folder_name: str = None,
+                            image_count: int = 1, category_hint: str = None) -> dict:
+    """
+    Generate optimized Etsy listing content using Groq Vision AI with expert SEO knowledge.
+    
+    Args:
+        image_data: Raw image bytes, base64 encoded image or file path
+        folder_name: Name of the product folder (provides context)
+        image_count: Number of images/variations in the product
+        category_hint: Suggested category (optional)
+    
+    Returns:
+        Dictionary with title, description, tags, category, style, and keyword insights
+    """
+    return generate_listing_content_batch([{
+        'image_data': image_data,
+        'folder_name': folder_name,
+        'image_count': image_count,
+        'category_hint': category_hint
+    }])[0]
 
-DESCRIPTION MUST INCLUDE:
-✅ Hook in first 160 characters (appears in search results!)
-✅ Emoji-enhanced headers for scannability
-✅ "What's Included" section with bullet points
-✅ Benefits & use cases
-✅ Gift-giving suggestions
-✅ FAQ answers (size, materials, delivery)
-✅ Strong call-to-action
-✅ Natural keyword integration (not stuffing!)
 
-Respond with ONLY the new description.""",
+def _build_title_prompt(current_content: dict, request: str) -> str:
+    return FIELD_PROMPT_TEMPLATES['title'].format(
+        title=current_content.get('title', ''),
+        tags=', '.join(current_content.get('tags', [])),
+        request=request
+    )
 
-        'tags': f"""As an Etsy SEO expert, generate 13 NEW perfectly-optimized tags.
 
-CURRENT TAGS: {', '.join(current_content.get('tags', []))}
-PRODUCT TITLE: {current_content.get('title', '')}
+def _build_description_prompt(current_content: dict, request: str) -> str:
+    return FIELD_PROMPT_TEMPLATES['description'].format(
+        description=current_content.get('description', ''),
+        title=current_content.get('title', ''),
+        request=request
+    )
 
-{f'SPECIFIC REQUEST: {instruction}' if instruction else 'Maximize search visibility with strategic tag selection.'}
 
-TAG STRATEGY:
-• Tags 1-3: Primary product keywords (exact match searches)
-• Tags 4-6: Long-tail descriptive phrases
-• Tags 7-9: Gift/occasion keywords
-• Tags 10-11: Style/aesthetic keywords
-• Tags 12-13: Material/technique keywords
+def _build_tags_prompt(current_content: dict, request: str) -> str:
+    return FIELD_PROMPT_TEMPLATES['tags'].format(
+        tags=', '.join(current_content.get('tags', [])),
+        title=current_content.get('title', ''),
+        request=request
+    )
 
-TAG RULES:
-✅ Each tag max 20 characters
-✅ Multi-word phrases, not single words
-✅ No words already in title (Etsy indexes separately)
-✅ Include synonyms buyers might search
-✅ Mix high-volume and niche terms
 
-Respond with ONLY a JSON array of exactly 13 tags."""
-    }
+# Per-field prompt builders; each only computes the values its template uses
+FIELD_PROMPT_BUILDERS = {
+    'title': _build_title_prompt,
+    'description': _build_description_prompt,
+    'tags': _build_tags_prompt
+}
+
+
+def regenerate_field(image_data: str, field: str, current_content: dict,
+                     instruction: str = None, max_size: int = REGENERATE_IMAGE_MAX_SIZE) -> str:
+    """
+    Regenerate a specific field with expert-level Etsy SEO optimization.
+    
+    Title and tag regeneration is text-only when the current description is
+    available, since it already summarizes the image. Otherwise the image is
+    downscaled to max_size and sent at low detail.
     
-    prompt = field_prompts.get(field)
-    if not prompt:
+    Args:
+        image_data: Raw image bytes, base64 encoded image or file path
+        field: Field to regenerate (title, description, tags)
+        current_content: Current listing content for context
+        instruction: Custom instruction for regeneration
+        max_size: Maximum image dimension when the image is sent
+    
+    Returns:
+        New optimized value for the field
+    """
+    global client
+    
+    if not client:
+        if not init_groq():
+            raise ValueError("Groq API key not configured")
+    
+    build_prompt = FIELD_PROMPT_BUILDERS.get(field)
+    if not build_prompt:
         raise ValueError(f"Unknown field: {field}")
     
+    prompt = build_prompt(
+        current_content,
+        f'SPECIFIC REQUEST: {instruction}' if instruction else FIELD_DEFAULT_REQUESTS[field]
+    )
+    
+    # Image tokens dominate request cost; skip the image when the
+    # description already describes the product
+    description = current_content.get('description')
+    if field in TEXT_ONLY_FIELDS and description:
+        user_content = [
+            {"type": "text", "text": f"PRODUCT DESCRIPTION:\n{description}"},
+            {"type": "text", "text": prompt}
+        ]
+    else:
+        if isinstance(image_data, (bytes, bytearray)):
+            image_url = encode_image_bytes_to_data_url(image_data, max_size)
+        elif _is_base64_blob(image_data):
+            image_url = encode_image_bytes_to_data_url(base64.b64decode(image_data), max_size)
+        else:
+            image_url = encode_image_to_data_url(image_data, max_size)
+        
+        user_content = [
+            {"type": "text", "text": prompt},
+            {
+                "type": "image_url",
+                "image_url": {"url": image_url, "detail": "low"}
+            }
+        ]
+    
     try:
         response = client.chat.completions.create(
             model="llama-3.2-90b-vision-preview",
             messages=[
-                {
-                    "role": "system",
-                    "content": ETSY_EXPERT_SYSTEM_PROMPT
-                },
+                SYSTEM_MESSAGE,
                 {
                     "role": "user",
-                    "content": [
-                        {"type": "text", "text": prompt},
-                        {
-                            "type": "image_url",
-                            "image_url": {"url": f"data:image/jpeg;base64,{image_data}"}
-                        }
-                    ]
+                    "content": user_content
                 }
             ],
             max_tokens=1500,
@@ -506,18 +1117,13 @@ Respond with ONLY a JSON array of exactly 13 tags."""
                 tags = json.loads(content)
             else:
                 # Try to extract JSON from response
-                import re
-                match = re.search(r'\[.*\]', content, re.DOTALL)
+                match = _JSON_ARRAY_RE.search(content)
                 if match:
                     tags = json.loads(match.group())
                 else:
                     tags = [t.strip().lower() for t in content.split(',')]
             
-            # Validate tags
-            tags = [tag[:20].lower() for tag in tags][:13]
-            while len(tags) < 13:
-                tags.append(f"handmade item {len(tags)}")
-            return tags
+            return _clean_tags(tags, PAD_TAGS_ITEM)
         
         # For title, ensure max length
         if field == 'title' and len(content) > 140:
@@ -561,20 +1167,16 @@ Respond in JSON format."""
         response = client.chat.completions.create(
             model="llama-3.2-90b-vision-preview",
             messages=[
-                {"role": "system", "content": ETSY_EXPERT_SYSTEM_PROMPT},
+                SYSTEM_MESSAGE,
                 {"role": "user", "content": prompt}
             ],
             max_tokens=1000,
-            temperature=0.7
+            temperature=0.7,
+            response_format={"type": "json_object"}
         )
         
         content = response.choices[0].message.content.strip()
-        if content.startswith('```'):
-            content = content.split('```')[1]
-            if content.startswith('json'):
-                content = content[4:]
-        
-        return json.loads(content)
+        return _loads_json(content)
         
     except Exception as e:
         return {
@@ -599,19 +1201,6 @@ def suggest_seasonal_keywords(month: int = None) -> list:
     if month is None:
         month = datetime.now().month
     
-    seasonal_map = {
-        1: ["new year", "organization", "planner", "resolution", "fresh start", "winter decor"],
-        2: ["valentine", "love gift", "romantic", "galentine", "heart design", "couples gift"],
-        3: ["spring decor", "easter", "st patrick", "spring cleaning", "pastel", "floral"],
-        4: ["easter gift", "spring wedding", "earth day", "garden", "mother day early"],
-        5: ["mother day", "mom gift", "graduation", "teacher appreciation", "memorial day"],
-        6: ["father day", "dad gift", "summer", "wedding season", "graduation gift"],
-        7: ["summer decor", "fourth july", "patriotic", "beach", "vacation", "outdoor"],
-        8: ["back to school", "teacher gift", "dorm decor", "fall prep", "organize"],
-        9: ["fall decor", "autumn", "pumpkin spice", "labor day", "back to school"],
-        10: ["halloween", "spooky", "fall gift", "thanksgiving prep", "harvest"],
-        11: ["thanksgiving", "black friday", "christmas early", "holiday gift", "gratitude"],
-        12: ["christmas gift", "holiday", "hanukkah", "new year eve", "winter", "stocking stuffer"]
-    }
-    
-    return seasonal_map.get(month, ["evergreen", "gift idea", "handmade"])
+    if 1 <= month <= 12:
+        return list(SEASONAL_KEYWORDS[month - 1])
+    return list(EVERGREEN_KEYWORDS)
@@ -5,26 +5,69 @@ Handles rate limiting, data freshness, and security notifications
 to comply with Etsy API Terms of Use.
 """
 
+import sys
 import time
+import atexit
 import logging
-from datetime import datetime, timedelta
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from dataclasses import dataclass, fields, replace
+from datetime import datetime, timedelta, timezone
 from functools import wraps
-from threading import Lock
+from threading import Event, Lock, Thread
+from typing import Union
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+try:
+    import orjson
+except ImportError:  # stdlib fallback produces the same JSON, just slower
+    orjson = None
+    import json
+
+# Module logger only; handlers and levels are configured by the application
 logger = logging.getLogger(__name__)
 
+
+class _RootHandlerForwarder(logging.Handler):
+    """Hand queued records to whatever handlers the application put on the root logger"""
+    
+    def emit(self, record):
+        for handler in logging.getLogger().handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+# Records are enqueued by the caller and written out on a background thread,
+# so security and rate limit paths never block on stream/file I/O
+_log_queue = queue.SimpleQueue()
+_log_forwarder = _RootHandlerForwarder()
+_log_listener = QueueListener(_log_queue, _log_forwarder)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# The stock QueueHandler is enough here: its handler lock only covers an O(1)
+# SimpleQueue.put, so callers never wait on I/O, and all formatting and writes
+# happen on the single listener thread
+logger.addHandler(QueueHandler(_log_queue))
+logger.propagate = False
+
+# Bound once for the breach path
+_log_critical = logger.critical
+
 # =============================================================================
 # RATE LIMITING (Section 2 - API Rate Limits)
 # =============================================================================
 
+SECONDS_PER_DAY = 24 * 60 * 60
+
 class RateLimiter:
     """
     Thread-safe rate limiter for Etsy API calls.
     
     Etsy's default rate limit varies, but we implement a conservative
     approach to avoid hitting limits.
+    
+    Per-second limiting is a token bucket refilled on the monotonic clock.
+    Waiting threads sleep without holding the lock.
     """
     
     def __init__(self, calls_per_second: float = 5.0, calls_per_day: int = 10000):
@@ -37,19 +80,26 @@ class RateLimiter:
         """
         self.calls_per_second = calls_per_second
         self.calls_per_day = calls_per_day
-        self.min_interval = 1.0 / calls_per_second
         
-        self.last_call_time = 0
+        # Token bucket holding at most one second's worth of calls
+        self.capacity = max(1.0, calls_per_second)
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        
         self.daily_calls = 0
         self.daily_reset_time = datetime.utcnow()
+        # Monotonic twin of daily_reset_time so the hot path needs no datetime math
+        self.daily_reset_mono = self.last_refill
         self.lock = Lock()
     
-    def _reset_daily_if_needed(self):
+    def _reset_daily_if_needed(self, now: float = None):
         """Reset daily counter if 24 hours have passed"""
-        now = datetime.utcnow()
-        if now - self.daily_reset_time >= timedelta(hours=24):
+        if now is None:
+            now = time.monotonic()
+        if now - self.daily_reset_mono >= SECONDS_PER_DAY:
             self.daily_calls = 0
-            self.daily_reset_time = now
+            self.daily_reset_time = datetime.utcnow()
+            self.daily_reset_mono = now
             logger.info("Rate limiter: Daily call counter reset")
     
     def wait_if_needed(self):
@@ -57,30 +107,35 @@ class RateLimiter:
         Block until it's safe to make another API call.
         Returns remaining daily calls.
         """
-        with self.lock:
-            self._reset_daily_if_needed()
-            
-            # Check daily limit
-            if self.daily_calls >= self.calls_per_day:
-                wait_time = (self.daily_reset_time + timedelta(hours=24) - datetime.utcnow()).total_seconds()
-                logger.warning(f"Daily rate limit reached. Resets in {wait_time:.0f} seconds")
-                raise RateLimitExceededError(
-                    f"Daily API limit of {self.calls_per_day} calls exceeded. "
-                    f"Resets in {wait_time/3600:.1f} hours."
-                )
-            
-            # Check per-second limit
-            now = time.time()
-            elapsed = now - self.last_call_time
-            
-            if elapsed < self.min_interval:
-                sleep_time = self.min_interval - elapsed
-                time.sleep(sleep_time)
-            
-            self.last_call_time = time.time()
-            self.daily_calls += 1
+        while True:
+            with self.lock:
+                # One clock read serves the daily reset check and the refill
+                now = time.monotonic()
+                self._reset_daily_if_needed(now)
+                
+                # Check daily limit
+                if self.daily_calls >= self.calls_per_day:
+                    wait_time = self.daily_reset_mono + SECONDS_PER_DAY - now
+                    logger.warning("Daily rate limit reached. Resets in %.0f seconds", wait_time)
+                    raise RateLimitExceededError(
+                        f"Daily API limit of {self.calls_per_day} calls exceeded. "
+                        f"Resets in {wait_time/3600:.1f} hours."
+                    )
+                
+                # Refill the per-second bucket (nothing to compute when it is already full)
+                if self.tokens < self.capacity:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.calls_per_second)
+                self.last_refill = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.daily_calls += 1
+                    return self.calls_per_day - self.daily_calls
+                
+                sleep_time = (1 - self.tokens) / self.calls_per_second
             
-            return self.calls_per_day - self.daily_calls
+            # Sleep outside the lock so other threads can queue up in parallel
+            time.sleep(sleep_time)
     
     def get_status(self) -> dict:
         """Get current rate limit status"""
@@ -138,7 +193,7 @@ def handle_rate_limit_response(response):
         else:
             wait_time = 60
         
-        logger.warning(f"Rate limited by Etsy. Waiting {wait_time} seconds...")
+        logger.warning("Rate limited by Etsy. Waiting %s seconds...", wait_time)
         return wait_time
     
     return None
@@ -152,6 +207,12 @@ def handle_rate_limit_response(response):
 LISTING_CACHE_MAX_AGE_HOURS = 6
 OTHER_DATA_CACHE_MAX_AGE_HOURS = 24
 
+# Max cache age keyed by is_listing, built once instead of per probe
+_MAX_CACHE_AGE = {
+    True: timedelta(hours=LISTING_CACHE_MAX_AGE_HOURS),
+    False: timedelta(hours=OTHER_DATA_CACHE_MAX_AGE_HOURS)
+}
+
 
 def is_cache_stale(synced_at: datetime, is_listing: bool = True) -> bool:
     """
@@ -168,19 +229,16 @@ def is_cache_stale(synced_at: datetime, is_listing: bool = True) -> bool:
     Returns:
         True if cache is stale and needs refresh
     """
-    if synced_at is None:
-        return True
-    
-    max_age_hours = LISTING_CACHE_MAX_AGE_HOURS if is_listing else OTHER_DATA_CACHE_MAX_AGE_HOURS
-    max_age = timedelta(hours=max_age_hours)
-    
-    return datetime.utcnow() - synced_at > max_age
+    return synced_at is None or datetime.utcnow() - synced_at > _MAX_CACHE_AGE[bool(is_listing)]
 
 
 def get_cache_age_info(synced_at: datetime, is_listing: bool = True) -> dict:
     """
     Get information about cache freshness.
     
+    Intended for diagnostics/UI; code that only branches on staleness
+    should use is_cache_stale.
+    
     Args:
         synced_at: When the data was last synced
         is_listing: Whether this is listing data
@@ -200,7 +258,7 @@ def get_cache_age_info(synced_at: datetime, is_listing: bool = True) -> dict:
     age = datetime.utcnow() - synced_at
     age_minutes = age.total_seconds() / 60
     max_age_hours = LISTING_CACHE_MAX_AGE_HOURS if is_listing else OTHER_DATA_CACHE_MAX_AGE_HOURS
-    is_stale = age > timedelta(hours=max_age_hours)
+    is_stale = age > _MAX_CACHE_AGE[bool(is_listing)]
     
     return {
         'is_stale': is_stale,
@@ -217,22 +275,136 @@ def get_cache_age_info(synced_at: datetime, is_listing: bool = True) -> dict:
 # =============================================================================
 
 # Contact emails for security notifications
-ETSY_SECURITY_EMAIL = "dpo@etsy.com"
-ADMIN_CONTACT_EMAIL = "iggy.lundmark@telefonista.nu"
+ETSY_SECURITY_EMAIL = sys.intern("dpo@etsy.com")
+ADMIN_CONTACT_EMAIL = sys.intern("iggy.lundmark@telefonista.nu")
+
+# Etsy must be notified within 24 hours of discovery
+BREACH_NOTIFICATION_SECONDS = 24 * 60 * 60
+
+@dataclass(slots=True)
+class BreachDetails:
+    """Fixed-shape breach record passed to notify_data_breach"""
+    description: str = 'Unknown'
+    affected_users: Union[int, str] = 'Unknown'
+    data_types: str = 'Unknown'
+    discovered_at: str = 'Unknown'
+    logged_at: str = ''
+    notification_deadline: str = ''
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'BreachDetails':
+        """Build a record from a legacy breach_details dict, ignoring unknown keys"""
+        return cls(**{name: data[name] for name in _BREACH_FIELDS if name in data})
+
+
+_BREACH_FIELDS = tuple(f.name for f in fields(BreachDetails))
+
+# Log banner for notify_data_breach, filled in with str.format
+_BREACH_TEMPLATE = """
+    ============================================================
+    DATA BREACH DETECTED - IMMEDIATE ACTION REQUIRED
+    ============================================================
+    
+    Description: {b.description}
+    Affected Users: {b.affected_users}
+    Data Types: {b.data_types}
+    Discovered At: {b.discovered_at}
+    
+    REQUIRED ACTIONS (per Etsy API Terms Section 7):
+    1. Notify Etsy at {etsy_security_email} WITHIN 24 HOURS
+    2. Notify affected Etsy sellers
+    3. Document the breach and remediation steps
+    
+    Notification Deadline: {b.notification_deadline}
+    
+    ============================================================
+    """
+
+# Constant part of the notify_data_breach result; only the deadline varies
+_BREACH_RETURN_BASE = {
+    'logged': True,
+    'notify_etsy_at': ETSY_SECURITY_EMAIL,
+    'admin_notified_at': ADMIN_CONTACT_EMAIL
+}
+
 
+def _dumps_json(obj) -> str:
+    """Serialize log payloads as JSON so log pipelines can parse them"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str).decode()
+    return json.dumps(obj, default=str, separators=(',', ':'))
 
-def log_security_event(event_type: str, details: dict):
+
+# Security events are buffered and written as one record per batch
+SECURITY_EVENT_BATCH_SIZE = 64
+SECURITY_EVENT_FLUSH_SECONDS = 0.1
+_security_events = []
+_security_events_lock = Lock()
+_security_events_pending = Event()  # Set while events are buffered
+_security_events_full = Event()  # Set once a full batch is buffered, to flush early
+
+
+def _write_security_log(msg: str, *args):
+    """
+    Write a WARNING record straight to the root handlers.
+    
+    Only called off the request path (flusher thread, exit), so the batch
+    skips the log queue instead of being buffered a second time.
+    """
+    if logger.isEnabledFor(logging.WARNING):
+        _log_forwarder.handle(logger.makeRecord(logger.name, logging.WARNING, __file__, 0, msg, args, None))
+
+
+def _flush_security_events():
+    """Write all buffered security events as a single log record"""
+    global _security_events
+    with _security_events_lock:
+        if not _security_events:
+            return
+        batch, _security_events = _security_events, []
+        _security_events_pending.clear()
+        _security_events_full.clear()
+    
+    if len(batch) == 1:
+        _write_security_log("SECURITY EVENT [%s]: %s", batch[0][1], _dumps_json(batch[0][2]))
+    else:
+        _write_security_log("SECURITY EVENTS (%d): %s", len(batch), _dumps_json(batch))
+
+
+def _run_security_event_flusher():
+    """Flush each batch SECURITY_EVENT_FLUSH_SECONDS after its first event, or once it fills up"""
+    while True:
+        _security_events_pending.wait()
+        _security_events_full.wait(SECURITY_EVENT_FLUSH_SECONDS)
+        _flush_security_events()
+
+
+Thread(target=_run_security_event_flusher, name='security-event-flusher', daemon=True).start()
+atexit.register(_flush_security_events)
+
+
+def log_security_event(event_type: str, /, **details):
     """
     Log a security-related event.
     
+    Events are buffered and flushed together once SECURITY_EVENT_BATCH_SIZE
+    have queued up or SECURITY_EVENT_FLUSH_SECONDS after the first one.
+    
     Args:
         event_type: Type of event (e.g., 'login_failed', 'token_compromised')
-        details: Event details
+        **details: Event details as keyword arguments
     """
-    logger.warning(f"SECURITY EVENT [{event_type}]: {details}")
+    with _security_events_lock:
+        _security_events.append((datetime.now(timezone.utc).isoformat(), event_type, details))
+        pending = len(_security_events)
+        # The flusher thread does the formatting and the write
+        if pending == 1:
+            _security_events_pending.set()
+        if pending >= SECURITY_EVENT_BATCH_SIZE:
+            _security_events_full.set()
 
 
-def notify_data_breach(breach_details: dict):
+def notify_data_breach(breach_details: Union[BreachDetails, dict]):
     """
     Handle data breach notification requirement.
     
@@ -243,46 +415,37 @@ def notify_data_breach(breach_details: dict):
     In production, this should integrate with your alerting system.
     
     Args:
-        breach_details: Dict with breach information
+        breach_details: BreachDetails (or a dict with the same keys)
             - description: What happened
             - affected_users: Number of users affected
             - data_types: What data was potentially exposed
             - discovered_at: When breach was discovered
-    """
-    breach_details['logged_at'] = datetime.utcnow().isoformat()
-    breach_details['notification_deadline'] = (datetime.utcnow() + timedelta(hours=24)).isoformat()
-    
-    logger.critical(f"""
-    ============================================================
-    DATA BREACH DETECTED - IMMEDIATE ACTION REQUIRED
-    ============================================================
-    
-    Description: {breach_details.get('description', 'Unknown')}
-    Affected Users: {breach_details.get('affected_users', 'Unknown')}
-    Data Types: {breach_details.get('data_types', 'Unknown')}
-    Discovered At: {breach_details.get('discovered_at', 'Unknown')}
+            The input is never modified.
     
-    REQUIRED ACTIONS (per Etsy API Terms Section 7):
-    1. Notify Etsy at {ETSY_SECURITY_EMAIL} WITHIN 24 HOURS
-    2. Notify affected Etsy sellers
-    3. Document the breach and remediation steps
+    Returns:
+        Dict with the notification deadline and contacts
+    """
+    if isinstance(breach_details, dict):
+        breach_details = BreachDetails.from_dict(breach_details)
     
-    Notification Deadline: {breach_details['notification_deadline']}
+    now_ts = time.time()
+    deadline = datetime.fromtimestamp(now_ts + BREACH_NOTIFICATION_SECONDS, timezone.utc).isoformat()
+    # Stamp a copy so the caller's record is left untouched
+    breach_details = replace(
+        breach_details,
+        logged_at=datetime.fromtimestamp(now_ts, timezone.utc).isoformat(),
+        notification_deadline=deadline
+    )
     
-    ============================================================
-    """)
+    if logger.isEnabledFor(logging.CRITICAL):
+        _log_critical(_BREACH_TEMPLATE.format(b=breach_details, etsy_security_email=ETSY_SECURITY_EMAIL))
     
     # TODO: In production, integrate with:
     # - Email alerting (send to admin immediately)
     # - Incident management system
     # - Automated Etsy notification if possible
     
-    return {
-        'logged': True,
-        'notify_etsy_at': ETSY_SECURITY_EMAIL,
-        'deadline': breach_details['notification_deadline'],
-        'admin_notified_at': ADMIN_CONTACT_EMAIL
-    }
+    return {**_BREACH_RETURN_BASE, 'deadline': deadline}
 
 
 def check_token_security(access_token: str, expected_shop_id: str) -> bool:
@@ -300,43 +463,76 @@ def check_token_security(access_token: str, expected_shop_id: str) -> bool:
     """
     # This would typically make a lightweight API call to verify the token
     # For now, we just log the check
-    if not access_token or not expected_shop_id:
-        log_security_event('invalid_token_check', {
-            'has_token': bool(access_token),
-            'has_shop_id': bool(expected_shop_id)
-        })
-        return False
+    if access_token and expected_shop_id:
+        return True
     
-    return True
+    log_security_event(
+        'invalid_token_check',
+        has_token=bool(access_token),
+        has_shop_id=bool(expected_shop_id)
+    )
+    return False
 
 
 # =============================================================================
 # COMPLIANCE STATUS
 # =============================================================================
 
+# Static part of the compliance report, built once at import.
+# Shared between calls, so callers must treat it as read-only.
+_STATIC_COMPLIANCE = {
+    'data_freshness': {
+        'enabled': True,
+        'listing_max_age_hours': LISTING_CACHE_MAX_AGE_HOURS,
+        'other_data_max_age_hours': OTHER_DATA_CACHE_MAX_AGE_HOURS
+    },
+    'security': {
+        'breach_notification_enabled': True,
+        'etsy_security_contact': ETSY_SECURITY_EMAIL,
+        'admin_contact': ADMIN_CONTACT_EMAIL,
+        'notification_deadline_hours': 24
+    }
+}
+
+
+# get_compliance_status result is reused for this long (health checks poll it)
+COMPLIANCE_STATUS_TTL_SECONDS = 0.5
+_compliance_status = None
+_compliance_status_time = float('-inf')  # time.monotonic() may start near 0
+_compliance_status_lock = Lock()
+
+
+def _copy_compliance_status(status: dict) -> dict:
+    """Shallow copy of a cached status; only the live rate_limiting entry is duplicated"""
+    return {**status, 'rate_limiting': dict(status['rate_limiting'])}
+
+
 def get_compliance_status() -> dict:
     """
     Get overall API compliance status.
     
+    The status is rebuilt at most every COMPLIANCE_STATUS_TTL_SECONDS. Each
+    caller gets its own top-level dict and rate_limiting entry; the static
+    sections are shared and must be treated as read-only.
+    
     Returns:
         Dict with compliance information
     """
-    rate_status = _rate_limiter.get_status()
-    
-    return {
-        'rate_limiting': {
-            'enabled': True,
-            'status': rate_status
-        },
-        'data_freshness': {
-            'enabled': True,
-            'listing_max_age_hours': LISTING_CACHE_MAX_AGE_HOURS,
-            'other_data_max_age_hours': OTHER_DATA_CACHE_MAX_AGE_HOURS
-        },
-        'security': {
-            'breach_notification_enabled': True,
-            'etsy_security_contact': ETSY_SECURITY_EMAIL,
-            'admin_contact': ADMIN_CONTACT_EMAIL,
-            'notification_deadline_hours': 24
-        }
-    }
+    global _compliance_status, _compliance_status_time
+    
+    if time.monotonic() - _compliance_status_time < COMPLIANCE_STATUS_TTL_SECONDS:
+        return _copy_compliance_status(_compliance_status)
+    
+    with _compliance_status_lock:
+        # Another thread may have refreshed it while we waited for the lock
+        now = time.monotonic()
+        if now - _compliance_status_time >= COMPLIANCE_STATUS_TTL_SECONDS:
+            _compliance_status = {
+                'rate_limiting': {
+                    'enabled': True,
+                    'status': _rate_limiter.get_status()
+                },
+                **_STATIC_COMPLIANCE
+            }
+            _compliance_status_time = now
+        return _copy_compliance_status(_compliance_status)
@@ -6,11 +6,18 @@ Main application file with all API routes.
 
 import os
 import base64
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from flask import Flask, request, jsonify, redirect, session
+from flask import Flask, Response, request, jsonify, redirect, session, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager, jwt_required, get_jwt_identity
-from sqlalchemy import inspect, text
+from sqlalchemy import func, inspect, insert, select, text
+from sqlalchemy.orm import defer, selectinload
 
 from config import config
 from models import db, User, Template, Upload, Listing, EtsyToken, ListingPreset, DescriptionTemplate, EtsyListing
@@ -20,23 +27,70 @@ from settings import settings_bp
 # from ai_generator import generate_listing_content, regenerate_field, encode_image_bytes_to_base64
 # from seo_scorer import calculate_seo_score
 from etsy_api import (
-    get_authorization_url, exchange_code_for_tokens, refresh_access_token,
+    get_authorization_url, exchange_code_for_tokens,
     get_shop_info, get_shipping_profiles, get_return_policies, get_shop_sections,
     create_draft_listing, upload_listing_image, upload_listing_video, publish_listing,
-    encrypt_token, decrypt_token, get_taxonomy_nodes, get_taxonomy_properties,
+    encrypt_token, get_taxonomy_nodes, get_taxonomy_properties,
     update_listing_property, get_listing_properties, set_listing_attributes_from_ai,
     get_shop_listings, get_all_shop_listings, get_listing, get_listing_images,
     delete_listing_image, update_listing
 )
-from scheduler import init_scheduler, schedule_publish, cancel_scheduled_publish, shutdown_scheduler
+from etsy_tokens import get_etsy_context, ensure_fresh_access_token, invalidate_etsy_context
+from scheduler import init_scheduler, schedule_publish, cancel_scheduled_publish, shutdown_scheduler, enqueue_job
 from api_compliance import is_cache_stale, get_cache_age_info, get_compliance_status, get_rate_limiter
 
 import atexit
 
+try:
+    import orjson
+    # Keep Flask's output: sorted keys, and datetimes/dataclasses go through
+    # Flask's own default() so their format does not change
+    ORJSON_OPTIONS = (
+        orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS |
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+except ImportError:
+    orjson = None
+
+# Root logging config lives in the application, not in library modules
+logging.basicConfig(level=logging.INFO)
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (used for jsonify and request.get_json)"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+def orjson_column_dumps(value):
+    """Serializer for JSON columns (images, tags, ...); must return str for the driver"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# Bump whenever migrate_database gains a statement, so existing databases re-run it
+SCHEMA_VERSION = 4
+
 
 def migrate_database(app):
-    """Add missing columns to existing tables"""
+    """
+    Add missing columns and indexes to existing tables.
+    
+    The applied SCHEMA_VERSION is stored in the schema_meta table; when it
+    matches, schema reflection and migration are skipped entirely.
+    """
     with app.app_context():
+        with db.engine.begin() as conn:
+            conn.execute(text(
+                'CREATE TABLE IF NOT EXISTS schema_meta (key VARCHAR(50) PRIMARY KEY, value VARCHAR(50))'
+            ))
+            applied = conn.execute(text("SELECT value FROM schema_meta WHERE key = 'schema_version'")).scalar()
+        if applied == str(SCHEMA_VERSION):
+            return
+        
         inspector = inspect(db.engine)
         
         # Define columns to add for each table
@@ -63,25 +117,68 @@ def migrate_database(app):
             ]
         }
         
+        table_names = set(inspector.get_table_names())
+        statements = []
         for table_name, columns in migrations.items():
-            if table_name in inspector.get_table_names():
-                existing_columns = [col['name'] for col in inspector.get_columns(table_name)]
-                
-                for col_name, col_type in columns:
-                    if col_name not in existing_columns:
-                        try:
-                            db.session.execute(text(f'ALTER TABLE {table_name} ADD COLUMN {col_name} {col_type}'))
-                            db.session.commit()
-                            print(f"Added column {col_name} to {table_name}")
-                        except Exception as e:
-                            db.session.rollback()
-                            print(f"Column {col_name} might already exist in {table_name}: {e}")
+            if table_name not in table_names:
+                continue
+            existing_columns = {col['name'] for col in inspector.get_columns(table_name)}
+            statements.extend(
+                (f'ALTER TABLE {table_name} ADD COLUMN {col_name} {col_type}', f"Added column {col_name} to {table_name}")
+                for col_name, col_type in columns
+                if col_name not in existing_columns
+            )
+        
+        # Indexes declared on the models after their tables first shipped
+        # (create_all does not add indexes to tables that already exist)
+        statements += [
+            ('CREATE INDEX IF NOT EXISTS ix_upload_user_created ON uploads (user_id, created_at DESC)', None),
+            ('CREATE INDEX IF NOT EXISTS ix_listing_upload_status ON listings (upload_id, status)', None),
+            ('CREATE INDEX IF NOT EXISTS ix_listing_preset_user_name ON listing_presets (user_id, name)', None),
+            ('CREATE INDEX IF NOT EXISTS ix_etsy_listing_user_synced ON etsy_listings (user_id, synced_at)', None),
+            ('CREATE INDEX IF NOT EXISTS ix_etsy_listing_user_state ON etsy_listings (user_id, state)', None),
+        ]
+        
+        # Trigram index so the Listing Manager's title ILIKE '%...%' search can
+        # use an index (Postgres only; SQLite has no equivalent)
+        if db.engine.dialect.name == 'postgresql':
+            statements += [
+                ('CREATE EXTENSION IF NOT EXISTS pg_trgm', None),
+                ('CREATE INDEX IF NOT EXISTS ix_etsy_listing_title_trgm ON etsy_listings '
+                 'USING gin (title gin_trgm_ops)', None),
+            ]
+        
+        # One transaction for the whole batch; each statement gets a savepoint
+        # so a single failure does not abort the rest
+        with db.engine.begin() as conn:
+            for statement, message in statements:
+                try:
+                    with conn.begin_nested():
+                        conn.execute(text(statement))
+                    if message:
+                        print(message)
+                except Exception as e:
+                    print(f"Migration statement failed ({statement}): {e}")
+            
+            # Record the version in the same transaction as the migration
+            conn.execute(text("DELETE FROM schema_meta WHERE key = 'schema_version'"))
+            conn.execute(
+                text("INSERT INTO schema_meta (key, value) VALUES ('schema_version', :version)"),
+                {'version': str(SCHEMA_VERSION)}
+            )
 
 
 def create_app(config_name='default'):
     """Application factory"""
     app = Flask(__name__)
     app.config.from_object(config[config_name])
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
+        # Encode/decode JSON columns with orjson as well (applies to the engine db creates)
+        engine_options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+        engine_options.setdefault('json_serializer', orjson_column_dumps)
+        engine_options.setdefault('json_deserializer', orjson.loads)
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
     
     # Initialize extensions
     db.init_app(app)
@@ -99,12 +196,15 @@ def create_app(config_name='default'):
     # Run migrations for any missing columns
     migrate_database(app)
     
-    # Initialize scheduler
-    init_scheduler(app)
-    atexit.register(shutdown_scheduler)
+    # Initialize scheduler (SCHEDULER_ENABLED=0 skips it, e.g. for one-off
+    # scripts; test apps never start it)
+    if os.environ.get('SCHEDULER_ENABLED', '1') == '1' and not app.config.get('TESTING'):
+        init_scheduler(app)
+        atexit.register(shutdown_scheduler)
     
-    # Store PKCE verifiers (in production, use Redis)
+    # Pending PKCE verifiers: state -> (verifier, created), oldest first
     app.pkce_verifiers = {}
+    app.pkce_verifiers_lock = threading.Lock()
     
     return app
 
@@ -137,15 +237,14 @@ def get_api_compliance_status():
     rate_limiter = get_rate_limiter()
     rate_status = rate_limiter.get_status()
     
-    # Get cache freshness for user's listings
-    from models import EtsyListing
-    oldest_listing = EtsyListing.query.filter_by(user_id=user_id).order_by(
-        EtsyListing.synced_at.asc()
-    ).first()
+    # Get cache freshness for user's listings (aggregated in the database)
+    oldest_synced_at = db.session.query(func.min(EtsyListing.synced_at)).filter(
+        EtsyListing.user_id == user_id
+    ).scalar()
     
     cache_freshness = None
-    if oldest_listing and oldest_listing.synced_at:
-        cache_freshness = get_cache_age_info(oldest_listing.synced_at, is_listing=True)
+    if oldest_synced_at:
+        cache_freshness = get_cache_age_info(oldest_synced_at, is_listing=True)
     
     return jsonify({
         'compliance': get_compliance_status(),
@@ -210,9 +309,25 @@ def delete_template(template_id):
 @app.route('/api/presets', methods=['GET'])
 @jwt_required()
 def get_presets():
-    """Get user's listing presets"""
+    """
+    Get user's listing presets.
+    
+    With ?fields=summary only the columns a picker needs are selected, and
+    plain rows are returned without building ORM objects.
+    """
     user_id = get_jwt_identity()
-    presets = ListingPreset.query.filter_by(user_id=user_id).order_by(ListingPreset.name).all()
+    
+    if request.args.get('fields') == 'summary':
+        rows = db.session.query(
+            ListingPreset.id, ListingPreset.name, ListingPreset.preset_type,
+            ListingPreset.price, ListingPreset.taxonomy_path
+        ).filter(ListingPreset.user_id == user_id).order_by(ListingPreset.name).all()
+        return jsonify([row._asdict() for row in rows])
+    
+    # to_dict reads each preset's description template name; load them in one query
+    presets = ListingPreset.query.filter_by(user_id=user_id).options(
+        selectinload(ListingPreset.description_template)
+    ).order_by(ListingPreset.name).all()
     return jsonify([p.to_dict() for p in presets])
 
 
@@ -313,6 +428,22 @@ def get_preset(preset_id):
     return jsonify(preset.to_dict())
 
 
+# Fields a client may change with PUT /api/presets/<id>
+PRESET_UPDATABLE_FIELDS = frozenset([
+    'name', 'preset_type', 'price', 'quantity', 'who_made', 'when_made',
+    'is_supply', 'taxonomy_id', 'taxonomy_path', 'listing_type',
+    'shipping_profile_id', 'return_policy_id', 'shop_section_id',
+    'should_auto_renew', 'is_taxable', 'is_customizable', 'production_partner_ids',
+    'is_personalizable', 'personalization_is_required',
+    'personalization_char_count_max', 'personalization_instructions',
+    'item_weight', 'item_weight_unit', 'item_length', 'item_width',
+    'item_height', 'item_dimensions_unit', 'processing_min', 'processing_max',
+    'materials', 'styles', 'default_tags', 'category_properties', 'description_source',
+    'description_template_id', 'manual_description',
+    'sku', 'primary_color', 'secondary_color', 'is_featured', 'note_to_buyers'
+])
+
+
 @app.route('/api/presets/<int:preset_id>', methods=['PUT'])
 @jwt_required()
 def update_preset(preset_id):
@@ -325,20 +456,10 @@ def update_preset(preset_id):
     
     data = request.get_json()
     
-    # Update all fields
-    for field in ['name', 'preset_type', 'price', 'quantity', 'who_made', 'when_made',
-                  'is_supply', 'taxonomy_id', 'taxonomy_path', 'listing_type',
-                  'shipping_profile_id', 'return_policy_id', 'shop_section_id',
-                  'should_auto_renew', 'is_taxable', 'is_customizable', 'production_partner_ids',
-                  'is_personalizable', 'personalization_is_required',
-                  'personalization_char_count_max', 'personalization_instructions',
-                  'item_weight', 'item_weight_unit', 'item_length', 'item_width',
-                  'item_height', 'item_dimensions_unit', 'processing_min', 'processing_max',
-                  'materials', 'styles', 'default_tags', 'category_properties', 'description_source',
-                  'description_template_id', 'manual_description',
-                  'sku', 'primary_color', 'secondary_color', 'is_featured', 'note_to_buyers']:
-        if field in data:
-            setattr(preset, field, data[field])
+    # Only touch the fields the client sent; the flush issues one UPDATE
+    # containing just the columns that actually changed
+    for field in PRESET_UPDATABLE_FIELDS.intersection(data):
+        setattr(preset, field, data[field])
     
     db.session.commit()
     
@@ -492,6 +613,35 @@ def get_seo_score():
 
 # ============== Etsy OAuth Routes (Login) ==============
 
+# Seconds a login has to come back through the callback
+PKCE_VERIFIER_TTL = 600
+# Hard cap on pending logins, since /api/etsy/login is unauthenticated
+PKCE_VERIFIER_MAX_ENTRIES = 10000
+
+
+def store_pkce_verifier(state, verifier):
+    """Remember a PKCE verifier for the callback, pruning abandoned logins"""
+    now = time.monotonic()
+    with app.pkce_verifiers_lock:
+        # Entries are in insertion order, so expired ones are all at the front;
+        # past the cap the oldest pending logins are dropped as well
+        while app.pkce_verifiers:
+            oldest = next(iter(app.pkce_verifiers))
+            if (now - app.pkce_verifiers[oldest][1] <= PKCE_VERIFIER_TTL
+                    and len(app.pkce_verifiers) < PKCE_VERIFIER_MAX_ENTRIES):
+                break
+            del app.pkce_verifiers[oldest]
+        app.pkce_verifiers[state] = (verifier, now)
+
+
+def pop_pkce_verifier(state):
+    """Take (get and delete) the verifier for a state, or None if unknown or expired"""
+    with app.pkce_verifiers_lock:
+        entry = app.pkce_verifiers.pop(state, None)
+    if entry and time.monotonic() - entry[1] <= PKCE_VERIFIER_TTL:
+        return entry[0]
+    return None
+
 @app.route('/api/etsy/login', methods=['GET'])
 def etsy_login():
     """
@@ -505,8 +655,8 @@ def etsy_login():
         state = secrets.token_urlsafe(32)
         auth_url, verifier, _ = get_authorization_url(state=state)
         
-        # Store verifier for callback (in production, use Redis with expiry)
-        app.pkce_verifiers[state] = verifier
+        # Store verifier for callback
+        store_pkce_verifier(state, verifier)
         
         return jsonify({'auth_url': auth_url})
         
@@ -533,8 +683,8 @@ def etsy_callback():
     if not code or not state:
         return redirect(f'{frontend_url}/login?error=missing_params')
     
-    # Get verifier
-    verifier = app.pkce_verifiers.get(state)
+    # Get verifier (single use, so it is removed here)
+    verifier = pop_pkce_verifier(state)
     if not verifier:
         return redirect(f'{frontend_url}/login?error=invalid_state')
     
@@ -542,9 +692,6 @@ def etsy_callback():
         # Exchange code for Etsy tokens
         tokens = exchange_code_for_tokens(code, verifier)
         
-        # Clean up verifier
-        del app.pkce_verifiers[state]
-        
         # Get shop info from Etsy
         etsy_user_id = tokens['access_token'].split('.')[0]
         shop_info = get_shop_info(tokens['access_token'], etsy_user_id)
@@ -572,6 +719,8 @@ def etsy_callback():
         etsy_token.shop_name = shop_name
         
         db.session.commit()
+        invalidate_etsy_context(user.id)
+        invalidate_shop_data(shop_id)
         
         # Create JWT tokens for the app
         jwt_tokens = create_tokens_for_user(user)
@@ -612,25 +761,62 @@ def etsy_disconnect():
     etsy_token = EtsyToken.query.filter_by(user_id=user_id).first()
     
     if etsy_token:
+        invalidate_shop_data(etsy_token.shop_id)
         db.session.delete(etsy_token)
         db.session.commit()
+    invalidate_etsy_context(user_id)
     
     return jsonify({'message': 'Etsy disconnected'})
 
 
+# Per-shop Etsy settings that rarely change: (kind, shop_id) -> (fetched_at, data)
+SHOP_DATA_CACHE_TTL_SECONDS = 10 * 60
+_shop_data_cache = {}
+_shop_data_cache_lock = threading.Lock()
+
+
+def get_cached_shop_data(kind, shop_id, fetch):
+    """
+    Return per-shop data from a short-lived cache, calling fetch() on a miss.
+    
+    Keyed by shop only (never by access token), so every session of the same
+    shop shares one entry.
+    """
+    key = (kind, str(shop_id))
+    with _shop_data_cache_lock:
+        cached = _shop_data_cache.get(key)
+    if cached and time.monotonic() - cached[0] < SHOP_DATA_CACHE_TTL_SECONDS:
+        return cached[1]
+    
+    data = fetch()
+    with _shop_data_cache_lock:
+        _shop_data_cache[key] = (time.monotonic(), data)
+    return data
+
+
+def invalidate_shop_data(shop_id):
+    """Forget all cached settings for a shop"""
+    shop_id = str(shop_id)
+    with _shop_data_cache_lock:
+        for key in [k for k in _shop_data_cache if k[1] == shop_id]:
+            del _shop_data_cache[key]
+
+
 @app.route('/api/etsy/shipping-profiles', methods=['GET'])
 @jwt_required()
 def get_etsy_shipping_profiles():
     """Get user's Etsy shipping profiles"""
     user_id = get_jwt_identity()
-    etsy_token = EtsyToken.query.filter_by(user_id=user_id).first()
+    access_token, shop_id = get_etsy_context(user_id)
     
-    if not etsy_token:
+    if not access_token:
         return jsonify({'error': 'Etsy not connected'}), 400
     
     try:
-        access_token = decrypt_token(etsy_token.access_token_encrypted)
-        profiles = get_shipping_profiles(access_token, etsy_token.shop_id)
+        profiles = get_cached_shop_data(
+            'shipping_profiles', shop_id,
+            lambda: get_shipping_profiles(access_token, shop_id)
+        )
         return jsonify(profiles)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -641,25 +827,54 @@ def get_etsy_shipping_profiles():
 def get_etsy_return_policies():
     """Get user's Etsy return policies"""
     user_id = get_jwt_identity()
-    etsy_token = EtsyToken.query.filter_by(user_id=user_id).first()
+    access_token, shop_id = get_etsy_context(user_id)
     
-    if not etsy_token:
+    if not access_token:
         return jsonify({'error': 'Etsy not connected'}), 400
     
     try:
-        access_token = decrypt_token(etsy_token.access_token_encrypted)
-        policies = get_return_policies(access_token, etsy_token.shop_id)
+        policies = get_cached_shop_data(
+            'return_policies', shop_id,
+            lambda: get_return_policies(access_token, shop_id)
+        )
         return jsonify(policies)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+# Etsy's public seller taxonomy changes on the order of weeks; serve it pre-serialized
+TAXONOMY_CACHE_TTL_SECONDS = 24 * 60 * 60
+_taxonomy_cache = {}  # None (all nodes) or taxonomy_id -> (fetched_at, json_bytes, etag)
+_taxonomy_lock = threading.Lock()
+
+
+def cached_taxonomy_response(key, fetch):
+    """
+    Serve taxonomy data as pre-serialized JSON, calling fetch() on a miss.
+    
+    The body is serialized once per fetch and tagged with a content hash,
+    so repeat requests carrying If-None-Match get a 304 with no body.
+    """
+    now = time.monotonic()
+    with _taxonomy_lock:
+        cached = _taxonomy_cache.get(key)
+    
+    if cached is None or now - cached[0] >= TAXONOMY_CACHE_TTL_SECONDS:
+        body = app.json.dumps(fetch()).encode()
+        cached = (now, body, hashlib.sha256(body).hexdigest())
+        with _taxonomy_lock:
+            _taxonomy_cache[key] = cached
+    
+    response = Response(cached[1], mimetype='application/json')
+    response.set_etag(cached[2])
+    return response.make_conditional(request)
+
+
 @app.route('/api/etsy/categories', methods=['GET'])
 def get_categories():
     """Get Etsy taxonomy/categories"""
     try:
-        categories = get_taxonomy_nodes()
-        return jsonify(categories)
+        return cached_taxonomy_response(None, get_taxonomy_nodes)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -671,13 +886,16 @@ def get_category_properties(taxonomy_id):
     Properties are category-specific attributes like Holiday, Color, Style, etc.
     Returns a list of properties with their possible values.
     """
-    try:
+    def fetch():
         properties = get_taxonomy_properties(taxonomy_id)
-        return jsonify({
+        return {
             'taxonomy_id': taxonomy_id,
             'properties': properties,
             'count': len(properties)
-        })
+        }
+    
+    try:
+        return cached_taxonomy_response(taxonomy_id, fetch)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -687,14 +905,13 @@ def get_category_properties(taxonomy_id):
 def get_etsy_shop_sections():
     """Get user's Etsy shop sections"""
     user_id = get_jwt_identity()
-    etsy_token = EtsyToken.query.filter_by(user_id=user_id).first()
+    access_token, shop_id = get_etsy_context(user_id)
     
-    if not etsy_token:
+    if not access_token:
         return jsonify({'error': 'Etsy not connected'}), 400
     
     try:
-        access_token = decrypt_token(etsy_token.access_token_encrypted)
-        sections = get_shop_sections(access_token, etsy_token.shop_id)
+        sections = get_shop_sections(access_token, shop_id)
         return jsonify(sections)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -702,13 +919,112 @@ def get_etsy_shop_sections():
 
 # ============== Upload Routes ==============
 
+def get_user_upload(upload_id, user_id, **kwargs):
+    """Look up an upload by primary key, or None if it is missing or not the user's"""
+    upload = db.session.get(Upload, upload_id, **kwargs)
+    if upload is None or upload.user_id != user_id:
+        return None
+    return upload
+
+
+def get_user_upload_listing(upload_id, listing_id, user_id):
+    """
+    Look up a listing within one of the user's uploads.
+    
+    Ownership and membership are checked in a single joined query; the
+    upload is only looked up again (id column only) to word the 404.
+    
+    Returns:
+        (listing, None), or (None, error message) if not found
+    """
+    listing = Listing.query.join(Upload).filter(
+        Listing.id == listing_id,
+        Listing.upload_id == upload_id,
+        Upload.user_id == user_id
+    ).first()
+    if listing:
+        return listing, None
+    
+    owns_upload = db.session.query(Upload.id).filter(
+        Upload.id == upload_id, Upload.user_id == user_id
+    ).first()
+    return None, 'Listing not found' if owns_upload else 'Upload not found'
+
+
+# Etsy's per-file limits, plus room for the multipart framing and small form fields
+VIDEO_MAX_BYTES = 100 * 1024 * 1024
+IMAGE_MAX_BYTES = 10 * 1024 * 1024
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+def declared_body_too_large(max_file_bytes):
+    """True if the request's Content-Length already rules out a file within the limit"""
+    return (request.content_length is not None
+            and request.content_length > max_file_bytes + MULTIPART_OVERHEAD_BYTES)
+
+
+def uploaded_file_size(file_storage):
+    """Size in bytes of an uploaded file, found by seeking rather than reading"""
+    stream = file_storage.stream
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    return size
+
+
+# Uploads (with their listings) loaded per round-trip while streaming the history
+UPLOADS_STREAM_BATCH_SIZE = 100
+
+
+def get_upload_summaries(user_id):
+    """Upload columns plus a listing count, without loading any listing rows"""
+    listing_count = select(func.count(Listing.id)).where(
+        Listing.upload_id == Upload.id
+    ).scalar_subquery()
+    
+    rows = db.session.query(
+        Upload.id, Upload.title, Upload.status, Upload.scheduled_for,
+        Upload.created_at, Upload.completed_at, Upload.error_message,
+        listing_count.label('listing_count')
+    ).filter(Upload.user_id == user_id).order_by(Upload.created_at.desc()).all()
+    
+    return [{
+        'id': row.id,
+        'title': row.title,
+        'status': row.status,
+        'scheduled_for': row.scheduled_for.isoformat() if row.scheduled_for else None,
+        'created_at': row.created_at.isoformat(),
+        'completed_at': row.completed_at.isoformat() if row.completed_at else None,
+        'error_message': row.error_message,
+        'listing_count': row.listing_count
+    } for row in rows]
+
+
 @app.route('/api/uploads', methods=['GET'])
 @jwt_required()
 def get_uploads():
-    """Get user's upload history"""
+    """
+    Get user's upload history.
+    
+    The JSON array is streamed one upload at a time, loading rows in batches,
+    so memory stays flat and the first bytes go out before every row is read.
+    """
     user_id = get_jwt_identity()
-    uploads = Upload.query.filter_by(user_id=user_id).order_by(Upload.created_at.desc()).all()
-    return jsonify([u.to_dict() for u in uploads])
+    
+    if request.args.get('fields') == 'summary':
+        return jsonify(get_upload_summaries(user_id))
+    
+    def generate():
+        uploads = Upload.query.options(selectinload(Upload.listings)).filter_by(
+            user_id=user_id
+        ).order_by(Upload.created_at.desc()).yield_per(UPLOADS_STREAM_BATCH_SIZE)
+        
+        yield '['
+        for index, upload in enumerate(uploads):
+            yield (',' if index else '') + app.json.dumps(upload.to_dict())
+        yield ']'
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
 
 
 @app.route('/api/uploads', methods=['POST'])
@@ -718,9 +1034,8 @@ def create_upload():
     user_id = get_jwt_identity()
     data = request.get_json()
     
-    # Check Etsy connection
-    etsy_token = EtsyToken.query.filter_by(user_id=user_id).first()
-    if not etsy_token:
+    # Check Etsy connection; only the row's existence matters, so skip decryption
+    if not db.session.query(EtsyToken.id).filter_by(user_id=user_id).first():
         return jsonify({'error': 'Etsy not connected'}), 400
     
     # Create upload
@@ -738,27 +1053,30 @@ def create_upload():
     db.session.add(upload)
     db.session.flush()  # Get upload.id
     
-    # Create listings
-    for listing_data in data.get('listings', []):
-        listing = Listing(
-            upload_id=upload.id,
-            folder_name=listing_data.get('folder_name'),
-            title=listing_data['title'],
-            description=listing_data.get('description', ''),
-            tags=listing_data.get('tags', []),
-            price=listing_data.get('price'),
-            quantity=listing_data.get('quantity', 999),
-            category=listing_data.get('category'),
-            taxonomy_id=listing_data.get('categoryId'),
-            shipping_profile_id=listing_data.get('shippingProfileId'),
-            return_policy_id=listing_data.get('returnPolicyId'),
-            styles=listing_data.get('styles', []),
-            listing_attributes=listing_data.get('listing_attributes', {}),
-            seo_score=listing_data.get('seo_score') or listing_data.get('seoScore'),
-            images=listing_data.get('images', []),
-            videos=listing_data.get('videos', [])
-        )
-        db.session.add(listing)
+    # Create listings with one multi-row INSERT instead of an ORM object per row
+    rows = [
+        {
+            'upload_id': upload.id,
+            'folder_name': listing_data.get('folder_name'),
+            'title': listing_data['title'],
+            'description': listing_data.get('description', ''),
+            'tags': listing_data.get('tags', []),
+            'price': listing_data.get('price'),
+            'quantity': listing_data.get('quantity', 999),
+            'category': listing_data.get('category'),
+            'taxonomy_id': listing_data.get('categoryId'),
+            'shipping_profile_id': listing_data.get('shippingProfileId'),
+            'return_policy_id': listing_data.get('returnPolicyId'),
+            'styles': listing_data.get('styles', []),
+            'listing_attributes': listing_data.get('listing_attributes', {}),
+            'seo_score': listing_data.get('seo_score') or listing_data.get('seoScore'),
+            'images': listing_data.get('images', []),
+            'videos': listing_data.get('videos', [])
+        }
+        for listing_data in data.get('listings', [])
+    ]
+    if rows:
+        db.session.execute(insert(Listing), rows)
     
     db.session.commit()
     
@@ -786,22 +1104,24 @@ def upload_video_to_listing(upload_id, listing_id):
     """
     user_id = get_jwt_identity()
     
-    # Validate upload ownership
-    upload = Upload.query.filter_by(id=upload_id, user_id=user_id).first()
-    if not upload:
-        return jsonify({'error': 'Upload not found'}), 404
+    # Reject oversized bodies before the body is parsed or spooled
+    if declared_body_too_large(VIDEO_MAX_BYTES):
+        return jsonify({'error': 'Video file too large. Maximum size is 100MB'}), 413
     
-    # Get the listing
-    listing = Listing.query.filter_by(id=listing_id, upload_id=upload_id).first()
-    if not listing:
-        return jsonify({'error': 'Listing not found'}), 404
+    # Get the listing, validating upload ownership
+    listing, error = get_user_upload_listing(upload_id, listing_id, user_id)
+    if error:
+        return jsonify({'error': error}), 404
     
     if not listing.etsy_listing_id:
         return jsonify({'error': 'Listing has not been published to Etsy yet'}), 400
     
-    # Check Etsy connection
-    etsy_token = EtsyToken.query.filter_by(user_id=user_id).first()
-    if not etsy_token:
+    # Check Etsy connection (refreshing the token if it has expired)
+    try:
+        access_token, shop_id = ensure_fresh_access_token(user_id)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    if not access_token:
         return jsonify({'error': 'Etsy not connected'}), 400
     
     # Get video file from request
@@ -817,44 +1137,26 @@ def upload_video_to_listing(upload_id, listing_id):
         return jsonify({'error': f'Invalid video format. Allowed: {", ".join(allowed_extensions)}'}), 400
     
     try:
-        access_token = decrypt_token(etsy_token.access_token_encrypted)
-        
-        # Check if token needs refresh
-        if etsy_token.expires_at and etsy_token.expires_at <= datetime.utcnow():
-            refresh_token_str = decrypt_token(etsy_token.refresh_token_encrypted)
-            new_tokens = refresh_access_token(refresh_token_str)
-            
-            etsy_token.access_token_encrypted = encrypt_token(new_tokens['access_token'])
-            etsy_token.refresh_token_encrypted = encrypt_token(new_tokens['refresh_token'])
-            etsy_token.expires_at = datetime.utcnow() + timedelta(seconds=new_tokens['expires_in'])
-            
-            access_token = new_tokens['access_token']
-            db.session.commit()
-        
-        # Read video data
-        video_data = video_file.read()
+        # Check file size (100MB limit) without reading it into memory
+        if uploaded_file_size(video_file) > VIDEO_MAX_BYTES:
+            return jsonify({'error': 'Video file too large. Maximum size is 100MB'}), 413
         
-        # Check file size (100MB limit)
-        if len(video_data) > 100 * 1024 * 1024:
-            return jsonify({'error': 'Video file too large. Maximum size is 100MB'}), 400
-        
-        # Upload to Etsy
+        # Upload to Etsy, streaming from the request's spooled temp file
         result = upload_listing_video(
             access_token,
-            etsy_token.shop_id,
+            shop_id,
             listing.etsy_listing_id,
-            video_data,
+            video_file.stream,
             video_file.filename
         )
         
-        # Update listing videos metadata
-        videos = listing.videos or []
-        videos.append({
+        # Update listing videos metadata; assign a new list, since a plain JSON
+        # column does not see in-place appends to the loaded one
+        listing.videos = [*(listing.videos or []), {
             'name': video_file.filename,
             'etsy_video_id': result.get('video_id'),
             'uploaded_at': datetime.utcnow().isoformat()
-        })
-        listing.videos = videos
+        }]
         db.session.commit()
         
         return jsonify({
@@ -883,22 +1185,24 @@ def upload_image_to_listing(upload_id, listing_id):
     """
     user_id = get_jwt_identity()
     
-    # Validate upload ownership
-    upload = Upload.query.filter_by(id=upload_id, user_id=user_id).first()
-    if not upload:
-        return jsonify({'error': 'Upload not found'}), 404
+    # Reject oversized bodies before the body is parsed or spooled
+    if declared_body_too_large(IMAGE_MAX_BYTES):
+        return jsonify({'error': 'Image file too large. Maximum size is 10MB'}), 413
     
-    # Get the listing
-    listing = Listing.query.filter_by(id=listing_id, upload_id=upload_id).first()
-    if not listing:
-        return jsonify({'error': 'Listing not found'}), 404
+    # Get the listing, validating upload ownership
+    listing, error = get_user_upload_listing(upload_id, listing_id, user_id)
+    if error:
+        return jsonify({'error': error}), 404
     
     if not listing.etsy_listing_id:
         return jsonify({'error': 'Listing has not been published to Etsy yet'}), 400
     
-    # Check Etsy connection
-    etsy_token = EtsyToken.query.filter_by(user_id=user_id).first()
-    if not etsy_token:
+    # Check Etsy connection (refreshing the token if it has expired)
+    try:
+        access_token, shop_id = ensure_fresh_access_token(user_id)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    if not access_token:
         return jsonify({'error': 'Etsy not connected'}), 400
     
     # Get image file from request
@@ -916,46 +1220,27 @@ def upload_image_to_listing(upload_id, listing_id):
         return jsonify({'error': f'Invalid image format. Allowed: {", ".join(allowed_extensions)}'}), 400
     
     try:
-        access_token = decrypt_token(etsy_token.access_token_encrypted)
+        # Check file size (10MB limit) without reading it into memory
+        if uploaded_file_size(image_file) > IMAGE_MAX_BYTES:
+            return jsonify({'error': 'Image file too large. Maximum size is 10MB'}), 413
         
-        # Check if token needs refresh
-        if etsy_token.expires_at and etsy_token.expires_at <= datetime.utcnow():
-            refresh_token_str = decrypt_token(etsy_token.refresh_token_encrypted)
-            new_tokens = refresh_access_token(refresh_token_str)
-            
-            etsy_token.access_token_encrypted = encrypt_token(new_tokens['access_token'])
-            etsy_token.refresh_token_encrypted = encrypt_token(new_tokens['refresh_token'])
-            etsy_token.expires_at = datetime.utcnow() + timedelta(seconds=new_tokens['expires_in'])
-            
-            access_token = new_tokens['access_token']
-            db.session.commit()
-        
-        # Read image data
-        image_data = image_file.read()
-        
-        # Check file size (10MB limit)
-        if len(image_data) > 10 * 1024 * 1024:
-            return jsonify({'error': 'Image file too large. Maximum size is 10MB'}), 400
-        
-        # Upload to Etsy
+        # Upload to Etsy, streaming from the request's spooled temp file
         result = upload_listing_image(
             access_token,
-            etsy_token.shop_id,
+            shop_id,
             listing.etsy_listing_id,
-            image_data,
+            image_file.stream,
             rank=rank,
             alt_text=alt_text
         )
         
-        # Update listing images metadata
-        images = listing.images or []
-        images.append({
+        # Update listing images metadata (new list, as for videos)
+        listing.images = [*(listing.images or []), {
             'name': image_file.filename,
             'etsy_image_id': result.get('listing_image_id'),
             'rank': rank,
             'uploaded_at': datetime.utcnow().isoformat()
-        })
-        listing.images = images
+        }]
         db.session.commit()
         
         return jsonify({
@@ -969,119 +1254,127 @@ def upload_image_to_listing(upload_id, listing_id):
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/uploads/<int:upload_id>/publish', methods=['POST'])
-@jwt_required()
-def publish_upload(upload_id):
-    """Publish an upload (create drafts on Etsy)"""
-    user_id = get_jwt_identity()
-    upload = Upload.query.filter_by(id=upload_id, user_id=user_id).first()
+# Concurrent Etsy draft creations per publish (the shared rate limiter still applies)
+PUBLISH_MAX_WORKERS = 5
+
+# Placeholder preset values that are not real Etsy shipping profile / return policy IDs
+NON_ETSY_SHIPPING_PROFILE_IDS = frozenset({'digital', 'no_returns'})
+NON_ETSY_RETURN_POLICY_IDS = frozenset({'no_returns', '14_days', '30_days'})
+
+
+def _build_etsy_listing_data(listing):
+    """Build the Etsy createDraftListing payload for a Listing"""
+    # Build listing data with all available fields
+    listing_data = {
+        'title': listing.title,
+        'description': listing.description,
+        'price': listing.price or 10.0,
+        'quantity': listing.quantity or 999,
+        'tags': listing.tags,
+        'is_digital': True
+    }
     
-    if not upload:
-        return jsonify({'error': 'Upload not found'}), 404
+    # Add taxonomy_id if available (category)
+    if listing.taxonomy_id:
+        listing_data['taxonomy_id'] = listing.taxonomy_id
     
-    etsy_token = EtsyToken.query.filter_by(user_id=user_id).first()
-    if not etsy_token:
-        return jsonify({'error': 'Etsy not connected'}), 400
+    # Add shipping profile if available and valid (not for digital)
+    if listing.shipping_profile_id and listing.shipping_profile_id not in NON_ETSY_SHIPPING_PROFILE_IDS:
+        try:
+            listing_data['shipping_profile_id'] = int(listing.shipping_profile_id)
+        except (ValueError, TypeError):
+            pass  # Skip if not a valid integer ID
+    
+    # Add return policy if available and valid
+    if listing.return_policy_id and listing.return_policy_id not in NON_ETSY_RETURN_POLICY_IDS:
+        try:
+            listing_data['return_policy_id'] = int(listing.return_policy_id)
+        except (ValueError, TypeError):
+            pass  # Skip if not a valid integer ID
+    
+    # Add styles if available (max 2)
+    if listing.styles:
+        listing_data['styles'] = listing.styles[:2]
+    # Also check listing_attributes for style array
+    elif listing.listing_attributes and listing.listing_attributes.get('style'):
+        listing_data['styles'] = listing.listing_attributes['style'][:2]
     
+    return listing_data
+
+
+def _create_etsy_draft(access_token, shop_id, listing_data, taxonomy_id, listing_attributes):
+    """
+    Create one draft listing on Etsy and set its properties.
+    
+    Safe to run in a worker thread: it only talks to Etsy, not the database.
+    
+    Returns:
+        The new Etsy listing ID as a string
+    """
+    # Create draft listing on Etsy
+    etsy_listing = create_draft_listing(access_token, shop_id, listing_data)
+    etsy_listing_id = str(etsy_listing['listing_id'])
+    
+    # Set listing properties (attributes) from AI-generated data
+    if listing_attributes and taxonomy_id:
+        try:
+            property_result = set_listing_attributes_from_ai(
+                access_token,
+                shop_id,
+                etsy_listing_id,
+                taxonomy_id,
+                listing_attributes
+            )
+            if property_result.get('errors'):
+                print(f"Property setting warnings: {property_result['errors']}")
+        except Exception as prop_error:
+            # Property setting failures are not critical - continue
+            print(f"Warning: Failed to set properties: {prop_error}")
+    
+    # Videos are uploaded separately via the /api/uploads/:id/videos endpoint
+    
+    return etsy_listing_id
+
+
+def create_upload_drafts(upload, access_token, shop_id):
+    """
+    Create Etsy drafts for every listing in an upload and record the outcome.
+    
+    Listing and upload statuses are committed here. Any unexpected error
+    marks the whole upload as failed and is re-raised.
+    """
     try:
-        access_token = decrypt_token(etsy_token.access_token_encrypted)
-        
-        # Check if token needs refresh
-        if etsy_token.expires_at and etsy_token.expires_at <= datetime.utcnow():
-            refresh_token = decrypt_token(etsy_token.refresh_token_encrypted)
-            new_tokens = refresh_access_token(refresh_token)
-            
-            etsy_token.access_token_encrypted = encrypt_token(new_tokens['access_token'])
-            etsy_token.refresh_token_encrypted = encrypt_token(new_tokens['refresh_token'])
-            etsy_token.expires_at = datetime.utcnow() + timedelta(seconds=new_tokens['expires_in'])
-            
-            access_token = new_tokens['access_token']
-            db.session.commit()
-        
         upload.status = 'uploading'
         db.session.commit()
         
-        # Process each listing
-        for listing in upload.listings:
+        # Read everything Etsy needs while still on the calling thread;
+        # the worker threads only make HTTP calls and never touch the session
+        listings = list(upload.listings)
+        jobs = [
+            (_build_etsy_listing_data(listing), listing.taxonomy_id, listing.listing_attributes)
+            for listing in listings
+        ]
+        
+        def publish_job(job):
             try:
-                # Build listing data with all available fields
-                listing_data = {
-                    'title': listing.title,
-                    'description': listing.description,
-                    'price': listing.price or 10.0,
-                    'quantity': listing.quantity or 999,
-                    'tags': listing.tags,
-                    'is_digital': True
-                }
-                
-                # Add taxonomy_id if available (category)
-                if listing.taxonomy_id:
-                    listing_data['taxonomy_id'] = listing.taxonomy_id
-                
-                # Add shipping profile if available and valid (not for digital)
-                if listing.shipping_profile_id and listing.shipping_profile_id not in ['digital', 'no_returns']:
-                    try:
-                        listing_data['shipping_profile_id'] = int(listing.shipping_profile_id)
-                    except (ValueError, TypeError):
-                        pass  # Skip if not a valid integer ID
-                
-                # Add return policy if available and valid
-                if listing.return_policy_id and listing.return_policy_id not in ['no_returns', '14_days', '30_days']:
-                    try:
-                        listing_data['return_policy_id'] = int(listing.return_policy_id)
-                    except (ValueError, TypeError):
-                        pass  # Skip if not a valid integer ID
-                
-                # Add styles if available (max 2)
-                if listing.styles:
-                    listing_data['styles'] = listing.styles[:2]
-                # Also check listing_attributes for style array
-                elif listing.listing_attributes and listing.listing_attributes.get('style'):
-                    listing_data['styles'] = listing.listing_attributes['style'][:2]
-                
-                # Create draft listing on Etsy
-                etsy_listing = create_draft_listing(
-                    access_token,
-                    etsy_token.shop_id,
-                    listing_data
-                )
-                
-                listing.etsy_listing_id = str(etsy_listing['listing_id'])
-                listing.status = 'uploaded'
-                
-                # Set listing properties (attributes) from AI-generated data
-                if listing.listing_attributes and listing.taxonomy_id:
-                    try:
-                        property_result = set_listing_attributes_from_ai(
-                            access_token,
-                            etsy_token.shop_id,
-                            listing.etsy_listing_id,
-                            listing.taxonomy_id,
-                            listing.listing_attributes
-                        )
-                        if property_result.get('errors'):
-                            print(f"Property setting warnings: {property_result['errors']}")
-                    except Exception as prop_error:
-                        # Property setting failures are not critical - continue
-                        print(f"Warning: Failed to set properties: {prop_error}")
-                
-                # Upload images would go here
-                # For each image in listing.images, upload to Etsy
-                
-                # Upload videos if present
-                # Note: Videos should be uploaded via the /api/uploads/:id/videos endpoint
-                # which handles the actual file upload from the frontend
-                # Videos in listing.videos are metadata only at this point
-                
-                db.session.commit()
-                
+                return _create_etsy_draft(access_token, shop_id, *job)
             except Exception as e:
-                listing.status = 'failed'
-                db.session.commit()
                 print(f"Failed to create listing: {e}")
+                return None
+        
+        with ThreadPoolExecutor(max_workers=PUBLISH_MAX_WORKERS) as pool:
+            results = list(pool.map(publish_job, jobs))
+        
+        failed_count = 0
+        for listing, etsy_listing_id in zip(listings, results):
+            if etsy_listing_id is None:
+                listing.status = 'failed'
+                failed_count += 1
+            else:
+                listing.etsy_listing_id = etsy_listing_id
+                listing.status = 'uploaded'
         
         # Update upload status
-        failed_count = Listing.query.filter_by(upload_id=upload.id, status='failed').count()
         if failed_count == 0:
             upload.status = 'published'
         else:
@@ -1091,12 +1384,77 @@ def publish_upload(upload_id):
         upload.completed_at = datetime.utcnow()
         db.session.commit()
         
-        return jsonify(upload.to_dict())
-        
     except Exception as e:
         upload.status = 'failed'
         upload.error_message = str(e)
         db.session.commit()
+        raise
+
+
+def run_publish_job(upload_id, user_id):
+    """Background entry point for POST /publish?background=1 (runs on the scheduler's pool)"""
+    with app.app_context():
+        upload = get_user_upload(upload_id, user_id, options=[selectinload(Upload.listings)])
+        if not upload:
+            print(f"Upload {upload_id} not found")
+            return
+        
+        try:
+            access_token, shop_id = ensure_fresh_access_token(user_id)
+            if not access_token:
+                raise Exception('Etsy not connected')
+        except Exception as e:
+            upload.status = 'failed'
+            upload.error_message = str(e)
+            db.session.commit()
+            return
+        
+        try:
+            create_upload_drafts(upload, access_token, shop_id)
+        except Exception as e:
+            print(f"Background publish failed for upload {upload_id}: {e}")
+
+
+@app.route('/api/uploads/<int:upload_id>/publish', methods=['POST'])
+@jwt_required()
+def publish_upload(upload_id):
+    """
+    Publish an upload (create drafts on Etsy).
+    
+    With ?background=1 the work is queued and 202 is returned straight away;
+    poll GET /api/uploads for the upload's status.
+    """
+    user_id = get_jwt_identity()
+    upload = get_user_upload(upload_id, user_id, options=[selectinload(Upload.listings)])
+    
+    if not upload:
+        return jsonify({'error': 'Upload not found'}), 404
+    
+    if request.args.get('background', type=int):
+        # Commit 'queued' first so the job never reads a stale status
+        previous_status = upload.status
+        upload.status = 'queued'
+        db.session.commit()
+        try:
+            enqueue_job(run_publish_job, [upload.id, user_id], f"publish_now_{upload.id}")
+        except Exception as e:
+            print(f"Could not queue publish for upload {upload.id}: {e}")
+            upload.status = previous_status
+            db.session.commit()
+            return jsonify({'error': 'Background publishing is unavailable'}), 503
+        return jsonify(upload.to_dict()), 202
+    
+    try:
+        access_token, shop_id = ensure_fresh_access_token(user_id)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    if not access_token:
+        return jsonify({'error': 'Etsy not connected'}), 400
+    
+    try:
+        create_upload_drafts(upload, access_token, shop_id)
+        return jsonify(upload.to_dict())
+    except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
@@ -1105,7 +1463,7 @@ def publish_upload(upload_id):
 def schedule_upload(upload_id):
     """Schedule an upload for later publishing"""
     user_id = get_jwt_identity()
-    upload = Upload.query.filter_by(id=upload_id, user_id=user_id).first()
+    upload = get_user_upload(upload_id, user_id)
     
     if not upload:
         return jsonify({'error': 'Upload not found'}), 404
@@ -1128,7 +1486,7 @@ def schedule_upload(upload_id):
 def cancel_upload(upload_id):
     """Cancel a scheduled upload"""
     user_id = get_jwt_identity()
-    upload = Upload.query.filter_by(id=upload_id, user_id=user_id).first()
+    upload = get_user_upload(upload_id, user_id)
     
     if not upload:
         return jsonify({'error': 'Upload not found'}), 404
@@ -1147,7 +1505,7 @@ def cancel_upload(upload_id):
 def delete_upload(upload_id):
     """Delete an upload and its listings"""
     user_id = get_jwt_identity()
-    upload = Upload.query.filter_by(id=upload_id, user_id=user_id).first()
+    upload = get_user_upload(upload_id, user_id)
     
     if not upload:
         return jsonify({'error': 'Upload not found'}), 404
@@ -1166,29 +1524,34 @@ def delete_upload(upload_id):
 
 def get_user_etsy_credentials(user_id):
     """Helper to get user's Etsy token and shop ID"""
-    etsy_token = EtsyToken.query.filter_by(user_id=user_id).first()
-    if not etsy_token:
-        return None, None, 'Etsy account not connected'
-    
-    # Check if token is expired and refresh if needed
-    if etsy_token.expires_at and etsy_token.expires_at < datetime.utcnow():
-        try:
-            refresh_token = decrypt_token(etsy_token.refresh_token_encrypted)
-            new_tokens = refresh_access_token(refresh_token)
-            
-            etsy_token.access_token_encrypted = encrypt_token(new_tokens['access_token'])
-            etsy_token.refresh_token_encrypted = encrypt_token(new_tokens['refresh_token'])
-            etsy_token.expires_at = datetime.utcnow() + timedelta(seconds=new_tokens['expires_in'])
-            db.session.commit()
-        except Exception as e:
-            return None, None, f'Token refresh failed: {str(e)}'
+    try:
+        access_token, shop_id = ensure_fresh_access_token(user_id)
+    except Exception as e:
+        return None, None, f'Token refresh failed: {str(e)}'
     
-    access_token = decrypt_token(etsy_token.access_token_encrypted)
-    shop_id = etsy_token.shop_id
+    if not access_token:
+        return None, None, 'Etsy account not connected'
     
     return access_token, shop_id, None
 
 
+# Etsy listing states the Listing Manager syncs and reports counts for
+ETSY_LISTING_STATES = ('active', 'draft', 'expired', 'inactive', 'sold_out')
+# Listing IDs per IN (...) lookup when preloading cached rows during a sync
+SYNC_LOOKUP_CHUNK_SIZE = 500
+
+
+def count_listings_by_state(user_id):
+    """Cached listing counts per state, from a single GROUP BY query"""
+    rows = db.session.query(EtsyListing.state, func.count(EtsyListing.id)).filter(
+        EtsyListing.user_id == user_id
+    ).group_by(EtsyListing.state).all()
+    
+    state_counts = dict.fromkeys(ETSY_LISTING_STATES, 0)
+    state_counts.update((state, count) for state, count in rows if state in state_counts)
+    return state_counts
+
+
 @app.route('/api/shop/sync', methods=['POST'])
 @jwt_required()
 def sync_shop_listings():
@@ -1202,7 +1565,7 @@ def sync_shop_listings():
     try:
         # Get states to sync (default: all states)
         data = request.get_json() or {}
-        states_to_sync = data.get('states', ['active', 'draft', 'expired', 'inactive', 'sold_out'])
+        states_to_sync = data.get('states', list(ETSY_LISTING_STATES))
         
         synced_count = 0
         
@@ -1213,14 +1576,22 @@ def sync_shop_listings():
                     includes=['Images']
                 )
                 
-                for etsy_listing in listings:
-                    listing_id = str(etsy_listing.get('listing_id'))
-                    
+                # Preload the cached rows for this batch with a few IN (...)
+                # queries instead of one SELECT (and autoflush) per listing
+                listing_ids = [str(etsy_listing.get('listing_id')) for etsy_listing in listings]
+                existing = {}
+                for start in range(0, len(listing_ids), SYNC_LOOKUP_CHUNK_SIZE):
+                    existing.update(
+                        (cached.etsy_listing_id, cached)
+                        for cached in EtsyListing.query.filter(
+                            EtsyListing.user_id == user_id,
+                            EtsyListing.etsy_listing_id.in_(listing_ids[start:start + SYNC_LOOKUP_CHUNK_SIZE])
+                        )
+                    )
+                
+                for etsy_listing, listing_id in zip(listings, listing_ids):
                     # Find or create local cache entry
-                    cached = EtsyListing.query.filter_by(
-                        user_id=user_id, 
-                        etsy_listing_id=listing_id
-                    ).first()
+                    cached = existing.get(listing_id)
                     
                     if not cached:
                         cached = EtsyListing(
@@ -1228,6 +1599,7 @@ def sync_shop_listings():
                             etsy_listing_id=listing_id
                         )
                         db.session.add(cached)
+                        existing[listing_id] = cached
                     
                     # Update cached data
                     cached.title = etsy_listing.get('title')
@@ -1283,10 +1655,7 @@ def sync_shop_listings():
         db.session.commit()
         
         # Get counts by state
-        state_counts = {}
-        for state in ['active', 'draft', 'expired', 'inactive', 'sold_out']:
-            count = EtsyListing.query.filter_by(user_id=user_id, state=state).count()
-            state_counts[state] = count
+        state_counts = count_listings_by_state(user_id)
         
         return jsonify({
             'message': f'Synced {synced_count} listings',
@@ -1302,7 +1671,12 @@ def sync_shop_listings():
 @app.route('/api/shop/listings', methods=['GET'])
 @jwt_required()
 def get_cached_listings():
-    """Get cached listings with pagination and filtering"""
+    """
+    Get cached listings with pagination and filtering.
+    
+    With ?fields=summary the (large) description column is neither loaded
+    nor returned.
+    """
     user_id = get_jwt_identity()
     
     # Query parameters
@@ -1312,13 +1686,17 @@ def get_cached_listings():
     search = request.args.get('search', '')
     sort_by = request.args.get('sort_by', 'last_modified_timestamp')
     sort_order = request.args.get('sort_order', 'desc')
+    summary = request.args.get('fields') == 'summary'
     
     # Base query
     query = EtsyListing.query.filter_by(user_id=user_id, state=state)
+    if summary:
+        query = query.options(defer(EtsyListing.description))
     
-    # Search filter
+    # Search filter (LIKE wildcards in the search text match literally)
     if search:
-        query = query.filter(EtsyListing.title.ilike(f'%{search}%'))
+        escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        query = query.filter(EtsyListing.title.ilike(f'%{escaped}%', escape='\\'))
     
     # Sorting
     sort_column = getattr(EtsyListing, sort_by, EtsyListing.last_modified_timestamp)
@@ -1327,29 +1705,29 @@ def get_cached_listings():
     else:
         query = query.order_by(sort_column.asc())
     
-    # Pagination
-    total = query.count()
-    listings = query.offset((page - 1) * per_page).limit(per_page).all()
+    # Pagination; the total rides along on each row as a window count, so
+    # a separate COUNT query is only needed for a page past the end
+    rows = query.add_columns(func.count().over().label('total')).offset(
+        (page - 1) * per_page
+    ).limit(per_page).all()
+    listings = [listing for listing, _ in rows]
+    if rows:
+        total = rows[0].total
+    else:
+        total = query.count() if page > 1 else 0
     
     # Get counts by state
-    state_counts = {}
-    for s in ['active', 'draft', 'expired', 'inactive', 'sold_out']:
-        state_counts[s] = EtsyListing.query.filter_by(user_id=user_id, state=s).count()
-    
-    # Check cache freshness (Etsy API Terms Section 5: max 6 hours for listings)
-    oldest_sync = None
-    needs_refresh = False
-    for listing in listings:
-        if listing.synced_at:
-            if oldest_sync is None or listing.synced_at < oldest_sync:
-                oldest_sync = listing.synced_at
-            if is_cache_stale(listing.synced_at, is_listing=True):
-                needs_refresh = True
+    state_counts = count_listings_by_state(user_id)
+    
+    # Check cache freshness (Etsy API Terms Section 5: max 6 hours for listings);
+    # the page is stale exactly when its oldest sync is
+    oldest_sync = min((l.synced_at for l in listings if l.synced_at), default=None)
+    needs_refresh = oldest_sync is not None and is_cache_stale(oldest_sync, is_listing=True)
     
     cache_info = get_cache_age_info(oldest_sync, is_listing=True) if oldest_sync else None
     
     return jsonify({
-        'listings': [l.to_dict() for l in listings],
+        'listings': [l.to_dict(include_description=not summary) for l in listings],
         'total': total,
         'page': page,
         'per_page': per_page,
@@ -1552,13 +1930,10 @@ def upload_listing_image_route(listing_id):
         image_file = request.files['image']
         rank = int(request.form.get('rank', 1))
         
-        # Read image bytes
-        image_bytes = image_file.read()
-        
-        # Upload to Etsy
+        # Upload to Etsy, streaming from the request's spooled temp file
         result = upload_listing_image(
             access_token, shop_id, listing_id,
-            image_bytes, rank=rank
+            image_file.stream, rank=rank
         )
         
         return jsonify({
@@ -1638,6 +2013,14 @@ def reorder_listing_images_route(listing_id):
         return jsonify({'error': str(e)}), 500
 
 
+# ============== Error Handlers ==============
+
+@app.errorhandler(413)
+def request_entity_too_large(e):
+    """Bodies over MAX_CONTENT_LENGTH get a JSON error like every other API failure"""
+    return jsonify({'error': 'Request too large'}), 413
+
+
 # ============== Health Check ==============
 
 @app.route('/api/health', methods=['GET'])
@@ -1650,5 +2033,6 @@ def health_check():
 
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
+    # Development server only; production runs under gunicorn (gunicorn.conf.py)
+    app.run(debug=app.config['DEBUG'], port=5000)
 
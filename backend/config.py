@@ -26,7 +26,7 @@ class Config:
     ETSY_REDIRECT_URI = os.environ.get('ETSY_REDIRECT_URI', 'http://localhost:5000/api/etsy/callback')
     
     # File upload settings
-    MAX_CONTENT_LENGTH = 50 * 1024 * 1024  # 50MB max
+    MAX_CONTENT_LENGTH = 110 * 1024 * 1024  # 110MB max (100MB Etsy videos + form overhead)
     UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), 'uploads')
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
     
@@ -44,8 +44,15 @@ class ProductionConfig(Config):
     DEBUG = False
 
 
+class TestingConfig(Config):
+    """Test suite configuration (no scheduler)"""
+    DEBUG = False
+    TESTING = True
+
+
 config = {
     'development': DevelopmentConfig,
     'production': ProductionConfig,
+    'testing': TestingConfig,
     'default': DevelopmentConfig
 }
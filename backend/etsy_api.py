@@ -10,15 +10,19 @@ Compliance with Etsy API Terms:
 """
 
 import os
+import io
 import base64
 import hashlib
 import secrets
 import time
 import logging
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.fields import RequestField
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
 from urllib.parse import urlencode
-from cryptography.fernet import Fernet
 
 # Import compliance utilities
 from api_compliance import get_rate_limiter, handle_rate_limit_response, RateLimitExceededError
@@ -34,20 +38,51 @@ ETSY_TOKEN_URL = 'https://api.etsy.com/v3/public/oauth/token'
 # Maximum retries for rate-limited requests
 MAX_RATE_LIMIT_RETRIES = 3
 
+# Shared session so Etsy calls reuse pooled keep-alive connections instead of a
+# new TCP+TLS handshake per call. Sized for the gunicorn threads plus the
+# publish workers. Only idempotent requests are retried on gateway errors,
+# and the last response is returned once retries run out so callers see the
+# status code as before; 429s are handled by make_etsy_request.
+ETSY_RETRY_METHODS = frozenset({'GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'})
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=ETSY_RETRY_METHODS,
+        raise_on_status=False
+    )
+))
+
 # Encryption for storing tokens
 _fernet = None
+_fernet_lock = threading.Lock()
 
 
 def get_fernet():
-    """Get or create Fernet instance for token encryption"""
+    """
+    Get or create the process-wide Fernet instance for token encryption.
+    
+    Built once under a lock: with threaded workers, two racing requests could
+    otherwise each generate a temporary development key, leaving tokens
+    encrypted under a key that is then discarded.
+    """
     global _fernet
     if _fernet is None:
-        key = os.environ.get('FERNET_KEY')
-        if not key:
-            # Generate a key for development (should be set in production)
-            key = Fernet.generate_key().decode()
-            print(f"Warning: Generated temporary FERNET_KEY. Set this in production: {key}")
-        _fernet = Fernet(key.encode() if isinstance(key, str) else key)
+        with _fernet_lock:
+            if _fernet is None:
+                # Imported on first use to keep cryptography off the startup path
+                from cryptography.fernet import Fernet
+                
+                key = os.environ.get('FERNET_KEY')
+                if not key:
+                    # Generate a key for development (should be set in production)
+                    key = Fernet.generate_key().decode()
+                    print(f"Warning: Generated temporary FERNET_KEY. Set this in production: {key}")
+                _fernet = Fernet(key.encode() if isinstance(key, str) else key)
     return _fernet
 
 
@@ -131,7 +166,7 @@ def exchange_code_for_tokens(code: str, verifier: str) -> dict:
         'code_verifier': verifier
     }
     
-    response = requests.post(ETSY_TOKEN_URL, data=data)
+    response = _session.post(ETSY_TOKEN_URL, data=data)
     
     if response.status_code != 200:
         raise Exception(f"Token exchange failed: {response.text}")
@@ -157,7 +192,7 @@ def refresh_access_token(refresh_token: str) -> dict:
         'refresh_token': refresh_token
     }
     
-    response = requests.post(ETSY_TOKEN_URL, data=data)
+    response = _session.post(ETSY_TOKEN_URL, data=data)
     
     if response.status_code != 200:
         raise Exception(f"Token refresh failed: {response.text}")
@@ -175,6 +210,83 @@ def get_auth_headers(access_token: str) -> dict:
     }
 
 
+class MultipartFileBody:
+    """
+    multipart/form-data request body that streams its file part.
+    
+    requests' files= builds the whole body in memory. This reads the file in
+    chunks as the socket drains and reports its length up front, so uploads
+    are sent with a Content-Length instead of chunked encoding.
+    """
+    
+    CHUNK_SIZE = 64 * 1024
+    
+    def __init__(self, fields: dict, file_field: str, filename: str, fileobj, content_type: str,
+                 boundary: str = None):
+        boundary = boundary or secrets.token_hex(16)
+        self.content_type = f'multipart/form-data; boundary={boundary}'
+        
+        # Part headers come from urllib3 (as with requests' files=), which
+        # escapes quotes and line breaks in client-supplied names/filenames
+        head = b''.join(
+            f'--{boundary}\r\n'.encode() + self._part_headers(name) + str(value).encode() + b'\r\n'
+            for name, value in fields.items()
+        )
+        head += f'--{boundary}\r\n'.encode() + self._part_headers(file_field, filename, content_type)
+        tail = f'\r\n--{boundary}--\r\n'.encode()
+        
+        fileobj.seek(0, os.SEEK_END)
+        file_size = fileobj.tell()
+        fileobj.seek(0)
+        
+        self._parts = [io.BytesIO(head), fileobj, io.BytesIO(tail)]
+        self._length = len(head) + file_size + len(tail)
+    
+    @staticmethod
+    def _part_headers(name: str, filename: str = None, content_type: str = None) -> bytes:
+        """Encoded header block (ending in a blank line) for one multipart part"""
+        field = RequestField(name=name, data=b'', filename=filename)
+        field.make_multipart(content_type=content_type)
+        return field.render_headers().encode()
+    
+    def __len__(self):
+        return self._length
+    
+    def read(self, size: int = -1) -> bytes:
+        chunks = []
+        while self._parts and (size < 0 or size > 0):
+            chunk = self._parts[0].read(size)
+            if not chunk:
+                self._parts.pop(0)
+                continue
+            chunks.append(chunk)
+            if size > 0:
+                size -= len(chunk)
+        return b''.join(chunks)
+    
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _post_file(url: str, headers: dict, fields: dict, file_field: str,
+               filename: str, file_data, content_type: str) -> requests.Response:
+    """POST a multipart upload; file_data may be bytes or a seekable file object (streamed)"""
+    if hasattr(file_data, 'read'):
+        body = MultipartFileBody(fields, file_field, filename, file_data, content_type)
+        return _session.post(url, headers={**headers, 'Content-Type': body.content_type}, data=body)
+    
+    return _session.post(
+        url,
+        headers=headers,
+        files={file_field: (filename, file_data, content_type)},
+        data=fields
+    )
+
+
 def make_etsy_request(method: str, url: str, **kwargs) -> requests.Response:
     """
     Make a rate-limited request to the Etsy API with retry on 429.
@@ -203,7 +315,7 @@ def make_etsy_request(method: str, url: str, **kwargs) -> requests.Response:
             raise
         
         # Make the request
-        request_func = getattr(requests, method.lower())
+        request_func = getattr(_session, method.lower())
         response = request_func(url, **kwargs)
         
         # Handle rate limiting response
@@ -226,7 +338,7 @@ def get_user_info(access_token: str) -> dict:
     headers = get_auth_headers(access_token)
     
     # Get token metadata (includes user_id)
-    response = requests.get(
+    response = _session.get(
         f'{ETSY_API_BASE}/application/openapi-ping',
         headers=headers
     )
@@ -241,7 +353,7 @@ def get_shop_info(access_token: str, user_id: str) -> dict:
     """Get the user's shop information"""
     headers = get_auth_headers(access_token)
     
-    response = requests.get(
+    response = _session.get(
         f'{ETSY_API_BASE}/application/users/{user_id}/shops',
         headers=headers
     )
@@ -259,7 +371,7 @@ def get_shipping_profiles(access_token: str, shop_id: str) -> list:
     """Get shop's shipping profiles"""
     headers = get_auth_headers(access_token)
     
-    response = requests.get(
+    response = _session.get(
         f'{ETSY_API_BASE}/application/shops/{shop_id}/shipping-profiles',
         headers=headers
     )
@@ -274,7 +386,7 @@ def get_return_policies(access_token: str, shop_id: str) -> list:
     """Get shop's return policies"""
     headers = get_auth_headers(access_token)
     
-    response = requests.get(
+    response = _session.get(
         f'{ETSY_API_BASE}/application/shops/{shop_id}/policies/return',
         headers=headers
     )
@@ -289,7 +401,7 @@ def get_shop_sections(access_token: str, shop_id: str) -> list:
     """Get shop's sections for organizing listings"""
     headers = get_auth_headers(access_token)
     
-    response = requests.get(
+    response = _session.get(
         f'{ETSY_API_BASE}/application/shops/{shop_id}/sections',
         headers=headers
     )
@@ -402,7 +514,7 @@ def create_draft_listing(access_token: str, shop_id: str, listing_data: dict) ->
     if listing_data.get('processing_max'):
         body['processing_max'] = listing_data['processing_max']
     
-    response = requests.post(
+    response = _session.post(
         f'{ETSY_API_BASE}/application/shops/{shop_id}/listings',
         headers=headers,
         json=body
@@ -415,7 +527,7 @@ def create_draft_listing(access_token: str, shop_id: str, listing_data: dict) ->
 
 
 def upload_listing_image(access_token: str, shop_id: str, listing_id: str, 
-                         image_data: bytes, rank: int = 1, alt_text: str = '') -> dict:
+                         image_data, rank: int = 1, alt_text: str = '') -> dict:
     """
     Upload an image to a listing.
     
@@ -423,7 +535,7 @@ def upload_listing_image(access_token: str, shop_id: str, listing_id: str,
         access_token: Valid access token
         shop_id: Shop ID
         listing_id: Listing ID
-        image_data: Image file bytes
+        image_data: Image file bytes, or a seekable file object to stream
         rank: Image position (1 = primary)
         alt_text: Alt text for accessibility
     
@@ -437,10 +549,6 @@ def upload_listing_image(access_token: str, shop_id: str, listing_id: str,
         'x-api-key': api_key
     }
     
-    files = {
-        'image': ('mockup.jpg', image_data, 'image/jpeg')
-    }
-    
     data = {
         'rank': rank,
         'overwrite': True
@@ -449,11 +557,9 @@ def upload_listing_image(access_token: str, shop_id: str, listing_id: str,
     if alt_text:
         data['alt_text'] = alt_text[:500]
     
-    response = requests.post(
+    response = _post_file(
         f'{ETSY_API_BASE}/application/shops/{shop_id}/listings/{listing_id}/images',
-        headers=headers,
-        files=files,
-        data=data
+        headers, data, 'image', 'mockup.jpg', image_data, 'image/jpeg'
     )
     
     if response.status_code not in [200, 201]:
@@ -463,7 +569,7 @@ def upload_listing_image(access_token: str, shop_id: str, listing_id: str,
 
 
 def upload_listing_video(access_token: str, shop_id: str, listing_id: str,
-                         video_data: bytes, video_name: str = 'video.mp4') -> dict:
+                         video_data, video_name: str = 'video.mp4') -> dict:
     """
     Upload a video to a listing.
     
@@ -477,7 +583,7 @@ def upload_listing_video(access_token: str, shop_id: str, listing_id: str,
         access_token: Valid access token
         shop_id: Shop ID
         listing_id: Listing ID
-        video_data: Video file bytes
+        video_data: Video file bytes, or a seekable file object to stream
         video_name: Original video filename for content type detection
     
     Returns:
@@ -497,14 +603,9 @@ def upload_listing_video(access_token: str, shop_id: str, listing_id: str,
     elif video_name.lower().endswith('.mp4'):
         content_type = 'video/mp4'
     
-    files = {
-        'video': (video_name, video_data, content_type)
-    }
-    
-    response = requests.post(
+    response = _post_file(
         f'{ETSY_API_BASE}/application/shops/{shop_id}/listings/{listing_id}/videos',
-        headers=headers,
-        files=files
+        headers, {}, 'video', video_name, video_data, content_type
     )
     
     if response.status_code not in [200, 201]:
@@ -526,7 +627,7 @@ def get_listing_videos(access_token: str, listing_id: str) -> list:
     """
     headers = get_auth_headers(access_token)
     
-    response = requests.get(
+    response = _session.get(
         f'{ETSY_API_BASE}/application/listings/{listing_id}/videos',
         headers=headers
     )
@@ -557,7 +658,7 @@ def delete_listing_video(access_token: str, shop_id: str, listing_id: str, video
         'x-api-key': api_key
     }
     
-    response = requests.delete(
+    response = _session.delete(
         f'{ETSY_API_BASE}/application/shops/{shop_id}/listings/{listing_id}/videos/{video_id}',
         headers=headers
     )
@@ -580,7 +681,7 @@ def update_listing(access_token: str, shop_id: str, listing_id: str, updates: di
     """
     headers = get_auth_headers(access_token)
     
-    response = requests.patch(
+    response = _session.patch(
         f'{ETSY_API_BASE}/application/shops/{shop_id}/listings/{listing_id}',
         headers=headers,
         json=updates
@@ -620,7 +721,7 @@ def delete_listing(access_token: str, listing_id: str) -> bool:
     """
     headers = get_auth_headers(access_token)
     
-    response = requests.delete(
+    response = _session.delete(
         f'{ETSY_API_BASE}/application/listings/{listing_id}',
         headers=headers
     )
@@ -632,7 +733,7 @@ def get_taxonomy_nodes() -> list:
     """Get Etsy's taxonomy (categories) for listings"""
     api_key = os.environ.get('ETSY_API_KEY')
     
-    response = requests.get(
+    response = _session.get(
         f'{ETSY_API_BASE}/application/seller-taxonomy/nodes',
         headers={'x-api-key': api_key}
     )
@@ -658,7 +759,7 @@ def get_taxonomy_properties(taxonomy_id: int) -> list:
     """
     api_key = os.environ.get('ETSY_API_KEY')
     
-    response = requests.get(
+    response = _session.get(
         f'{ETSY_API_BASE}/application/seller-taxonomy/nodes/{taxonomy_id}/properties',
         headers={'x-api-key': api_key}
     )
@@ -703,7 +804,7 @@ def update_listing_property(access_token: str, shop_id: str, listing_id: str,
     if scale_id is not None:
         body['scale_id'] = scale_id
     
-    response = requests.put(
+    response = _session.put(
         f'{ETSY_API_BASE}/application/shops/{shop_id}/listings/{listing_id}/properties/{property_id}',
         headers=headers,
         data=body  # This endpoint uses form data, not JSON
@@ -731,7 +832,7 @@ def get_listing_properties(access_token: str, shop_id: str, listing_id: str) ->
     """
     headers = get_auth_headers(access_token)
     
-    response = requests.get(
+    response = _session.get(
         f'{ETSY_API_BASE}/application/shops/{shop_id}/listings/{listing_id}/properties',
         headers=headers
     )
@@ -758,7 +859,7 @@ def delete_listing_property(access_token: str, shop_id: str, listing_id: str,
     """
     headers = get_auth_headers(access_token)
     
-    response = requests.delete(
+    response = _session.delete(
         f'{ETSY_API_BASE}/application/shops/{shop_id}/listings/{listing_id}/properties/{property_id}',
         headers=headers
     )
@@ -934,7 +1035,7 @@ def get_shop_listings(access_token: str, shop_id: str, state: str = 'active',
     if includes:
         params['includes'] = ','.join(includes)
     
-    response = requests.get(
+    response = _session.get(
         f'{ETSY_API_BASE}/application/shops/{shop_id}/listings',
         headers=headers,
         params=params
@@ -1000,7 +1101,7 @@ def get_listing(access_token: str, listing_id: str, includes: list = None) -> di
     if includes:
         params['includes'] = ','.join(includes)
     
-    response = requests.get(
+    response = _session.get(
         f'{ETSY_API_BASE}/application/listings/{listing_id}',
         headers=headers,
         params=params
@@ -1025,7 +1126,7 @@ def get_listing_images(access_token: str, listing_id: str) -> list:
     """
     headers = get_auth_headers(access_token)
     
-    response = requests.get(
+    response = _session.get(
         f'{ETSY_API_BASE}/application/listings/{listing_id}/images',
         headers=headers
     )
@@ -1051,7 +1152,7 @@ def delete_listing_image(access_token: str, shop_id: str, listing_id: str, listi
     """
     headers = get_auth_headers(access_token)
     
-    response = requests.delete(
+    response = _session.delete(
         f'{ETSY_API_BASE}/application/shops/{shop_id}/listings/{listing_id}/images/{listing_image_id}',
         headers=headers
     )
@@ -1127,7 +1228,7 @@ def update_listing_image_rank(access_token: str, shop_id: str, listing_id: str,
     # updating the image with a new rank value
     data = {'rank': rank}
     
-    response = requests.patch(
+    response = _session.patch(
         f'{ETSY_API_BASE}/application/shops/{shop_id}/listings/{listing_id}/images/{listing_image_id}',
         headers=headers,
         data=data
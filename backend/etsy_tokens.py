@@ -0,0 +1,115 @@
+"""
+Etsy token cache for List-And-Go
+
+Decrypted Etsy access tokens are cached per user, and expired tokens are
+refreshed under a lock. Both the API routes and the scheduler's publish jobs
+use this module, so they share one cache and one set of refresh locks.
+"""
+
+import threading
+from datetime import datetime, timedelta
+
+from models import db, EtsyToken
+from etsy_api import refresh_access_token, encrypt_token, decrypt_token
+
+# Decrypted access tokens are reused for up to this long (never past expiry)
+ETSY_TOKEN_CACHE_TTL = timedelta(minutes=5)
+# Refresh this long before expires_at, so a token cannot expire mid-request
+ETSY_TOKEN_REFRESH_MARGIN = timedelta(seconds=60)
+_etsy_token_cache = {}  # user_id -> (access_token, shop_id, valid_until)
+# Refreshes are serialised on a fixed set of lock stripes picked by user ID,
+# so the lock table stays bounded however many users log in
+ETSY_REFRESH_LOCK_STRIPES = 64
+_etsy_refresh_locks = tuple(threading.Lock() for _ in range(ETSY_REFRESH_LOCK_STRIPES))
+_etsy_token_cache_lock = threading.Lock()
+
+
+def _get_cached_etsy_context(user_id, now):
+    """Return the cached (access_token, shop_id) if still valid, else None"""
+    with _etsy_token_cache_lock:
+        cached = _etsy_token_cache.get(user_id)
+    if cached and now < cached[2]:
+        return cached[0], cached[1]
+    return None
+
+
+def _cache_etsy_context(user_id, access_token, etsy_token, now):
+    """Cache a decrypted token until the TTL or shortly before the token expires, whichever is first"""
+    valid_until = now + ETSY_TOKEN_CACHE_TTL
+    if etsy_token.expires_at:
+        valid_until = min(valid_until, etsy_token.expires_at - ETSY_TOKEN_REFRESH_MARGIN)
+    if now < valid_until:
+        with _etsy_token_cache_lock:
+            _etsy_token_cache[user_id] = (access_token, etsy_token.shop_id, valid_until)
+
+
+def get_etsy_context(user_id):
+    """
+    Get a user's decrypted Etsy access token and shop ID.
+    
+    Served from an in-process cache so hot routes skip the EtsyToken query
+    and Fernet decryption. Expired tokens are never returned from the cache.
+    
+    Returns:
+        (access_token, shop_id), or (None, None) if Etsy is not connected
+    """
+    now = datetime.utcnow()
+    cached = _get_cached_etsy_context(user_id, now)
+    if cached:
+        return cached
+    
+    etsy_token = EtsyToken.query.filter_by(user_id=user_id).first()
+    if not etsy_token:
+        return None, None
+    
+    access_token = decrypt_token(etsy_token.access_token_encrypted)
+    _cache_etsy_context(user_id, access_token, etsy_token, now)
+    return access_token, etsy_token.shop_id
+
+
+def ensure_fresh_access_token(user_id):
+    """
+    Get a user's Etsy access token and shop ID, refreshing the token if expired.
+    
+    Refreshes are serialised per user, so concurrent requests that all see an
+    expired token trigger a single call to Etsy; the others pick up the new
+    token once the lock is released.
+    
+    Returns:
+        (access_token, shop_id), or (None, None) if Etsy is not connected
+    
+    Raises:
+        Exception: If the token refresh fails
+    """
+    cached = _get_cached_etsy_context(user_id, datetime.utcnow())
+    if cached:
+        return cached
+    
+    with _etsy_refresh_locks[hash(user_id) % ETSY_REFRESH_LOCK_STRIPES]:
+        # Re-read the row: another request may have refreshed it while we waited
+        etsy_token = EtsyToken.query.filter_by(user_id=user_id).populate_existing().first()
+        if not etsy_token:
+            return None, None
+        
+        now = datetime.utcnow()
+        if etsy_token.expires_at and etsy_token.expires_at - ETSY_TOKEN_REFRESH_MARGIN <= now:
+            refresh_token = decrypt_token(etsy_token.refresh_token_encrypted)
+            new_tokens = refresh_access_token(refresh_token)
+            
+            etsy_token.access_token_encrypted = encrypt_token(new_tokens['access_token'])
+            etsy_token.refresh_token_encrypted = encrypt_token(new_tokens['refresh_token'])
+            etsy_token.expires_at = now + timedelta(seconds=new_tokens['expires_in'])
+            db.session.commit()
+            
+            access_token = new_tokens['access_token']
+        else:
+            access_token = decrypt_token(etsy_token.access_token_encrypted)
+        
+        _cache_etsy_context(user_id, access_token, etsy_token, now)
+        return access_token, etsy_token.shop_id
+
+
+def invalidate_etsy_context(user_id):
+    """Drop a user's cached Etsy token after it is replaced or removed"""
+    with _etsy_token_cache_lock:
+        _etsy_token_cache.pop(user_id, None)
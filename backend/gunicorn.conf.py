@@ -0,0 +1,22 @@
+"""
+Gunicorn configuration for the API
+
+Run with: gunicorn -c gunicorn.conf.py app:app
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# A single process keeps one APScheduler instance and one set of in-memory
+# caches (PKCE verifiers, Etsy tokens, shop data). Concurrency comes from
+# threads, which suits the mostly I/O-bound Etsy calls.
+workers = 1
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+
+# Reuse client connections instead of a new TCP handshake per request
+keepalive = 5
+
+# Image/video uploads to Etsy can take a while
+timeout = 120
@@ -66,16 +66,23 @@ class Upload(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     title = db.Column(db.String(200))
-    status = db.Column(db.String(20), default='draft')  # draft, scheduled, uploading, published, failed
+    status = db.Column(db.String(20), default='draft')  # draft, scheduled, queued, uploading, published, failed
     scheduled_for = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     completed_at = db.Column(db.DateTime)
     error_message = db.Column(db.Text)
     
+    # Serves get_uploads: filter by user, newest first
+    __table_args__ = (
+        db.Index('ix_upload_user_created', 'user_id', created_at.desc()),
+    )
+    
     # Relationships
-    listings = db.relationship('Listing', backref='upload', lazy='dynamic', cascade='all, delete-orphan')
+    # Plain list (not dynamic) so routes can eager-load it with selectinload
+    listings = db.relationship('Listing', backref='upload', lazy='select', cascade='all, delete-orphan')
     
     def to_dict(self):
+        listings = [l.to_dict() for l in self.listings]
         return {
             'id': self.id,
             'title': self.title,
@@ -84,8 +91,8 @@ class Upload(db.Model):
             'created_at': self.created_at.isoformat(),
             'completed_at': self.completed_at.isoformat() if self.completed_at else None,
             'error_message': self.error_message,
-            'listing_count': self.listings.count(),
-            'listings': [l.to_dict() for l in self.listings]
+            'listing_count': len(listings),
+            'listings': listings
         }
 
 
@@ -133,6 +140,11 @@ class Listing(db.Model):
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Covers lookups by upload_id alone as well as by (upload_id, status)
+    __table_args__ = (
+        db.Index('ix_listing_upload_status', 'upload_id', 'status'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -339,6 +351,11 @@ class ListingPreset(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Serves get_presets: filter by user, ordered by name
+    __table_args__ = (
+        db.Index('ix_listing_preset_user_name', 'user_id', 'name'),
+    )
+    
     # Relationships
     user = db.relationship('User', backref=db.backref('listing_presets', lazy='dynamic'))
     description_template = db.relationship('DescriptionTemplate', backref='presets')
@@ -526,22 +543,24 @@ class EtsyListing(db.Model):
     # Our cache timestamp
     synced_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    # Unique constraint on user + etsy_listing_id
+    # Unique constraint on user + etsy_listing_id; the indexes serve the
+    # oldest-sync lookup in the compliance status and the per-state counts
     __table_args__ = (
         db.UniqueConstraint('user_id', 'etsy_listing_id', name='unique_user_listing'),
+        db.Index('ix_etsy_listing_user_synced', 'user_id', 'synced_at'),
+        db.Index('ix_etsy_listing_user_state', 'user_id', 'state'),
     )
     
-    def to_dict(self):
+    def to_dict(self, include_description=True):
         # Calculate price from amount/divisor
         price = None
         if self.price_amount is not None and self.price_divisor:
             price = self.price_amount / self.price_divisor
         
-        return {
+        data = {
             'id': self.id,
             'etsy_listing_id': self.etsy_listing_id,
             'title': self.title,
-            'description': self.description,
             'tags': self.tags or [],
             'state': self.state,
             'sku': self.sku,
@@ -560,5 +579,11 @@ class EtsyListing(db.Model):
             'ending_timestamp': self.ending_timestamp.isoformat() if self.ending_timestamp else None,
             'synced_at': self.synced_at.isoformat() if self.synced_at else None
         }
+        
+        # Skipped for list views that defer the column (avoids a lazy load per row)
+        if include_description:
+            data['description'] = self.description
+        
+        return data
 
 
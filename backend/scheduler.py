@@ -6,23 +6,100 @@ with PostgreSQL job store for persistence.
 """
 
 import os
+import tempfile
+import threading
 from datetime import datetime
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.executors.pool import ThreadPoolExecutor
 
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, so every process runs its own jobs
+    fcntl = None
+
 # Scheduler instance
 scheduler = None
 
+# Only the process holding this lock runs jobs; others just write them to the job store
+SCHEDULER_LOCK_PATH = os.environ.get(
+    'SCHEDULER_LOCK_PATH', os.path.join(tempfile.gettempdir(), 'list-and-go-scheduler.lock')
+)
+# How often the running scheduler re-reads the job store for jobs added by other processes
+SCHEDULER_POLL_SECONDS = 15
+
+_scheduler_lock_file = None
+# Set on shutdown to stop a paused process from retrying the lock
+_scheduler_stopping = threading.Event()
+
+
+def _acquire_scheduler_lock() -> bool:
+    """Take the process-lifetime scheduler lock; False if another process holds it"""
+    global _scheduler_lock_file
+    
+    if fcntl is None:
+        return True
+    
+    lock_file = open(SCHEDULER_LOCK_PATH, 'w')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    
+    _scheduler_lock_file = lock_file
+    return True
+
+
+def _poll_job_store():
+    """No-op; each run wakes the scheduler so it sees jobs stored by other processes"""
+
+
+def _start_polling(sched):
+    """Schedule the job store poll on the process-local job store"""
+    sched.add_job(
+        func=_poll_job_store,
+        trigger='interval',
+        seconds=SCHEDULER_POLL_SECONDS,
+        id='poll_job_store',
+        jobstore='local',
+        replace_existing=True
+    )
+
+
+def _retry_scheduler_lock(sched):
+    """
+    Retry the scheduler lock from a paused process until it is acquired.
+    
+    Runs on its own thread, since a paused scheduler runs no jobs. Once the
+    lock holder exits, the first process to retry takes over and resumes.
+    """
+    while not _scheduler_stopping.wait(SCHEDULER_POLL_SECONDS):
+        if _acquire_scheduler_lock():
+            _start_polling(sched)
+            sched.resume()
+            print("Scheduler lock acquired, resuming jobs")
+            return
+
 
 def init_scheduler(app):
-    """Initialize the scheduler with the Flask app"""
+    """
+    Initialize the scheduler with the Flask app.
+    
+    With several worker processes only the one holding the scheduler lock
+    executes jobs. The others start paused: jobs they add are persisted to the
+    shared job store and picked up by the running scheduler within
+    SCHEDULER_POLL_SECONDS. Paused processes keep retrying the lock, so one of
+    them takes over if the lock holder exits.
+    """
     global scheduler
     
     database_url = app.config.get('SQLALCHEMY_DATABASE_URI', 'sqlite:///etsy_uploader.db')
     
     jobstores = {
-        'default': SQLAlchemyJobStore(url=database_url)
+        'default': SQLAlchemyJobStore(url=database_url),
+        'local': MemoryJobStore()
     }
     
     executors = {
@@ -31,7 +108,9 @@ def init_scheduler(app):
     
     job_defaults = {
         'coalesce': False,
-        'max_instances': 3
+        'max_instances': 3,
+        # Jobs stored by another process may be seen up to one poll late
+        'misfire_grace_time': SCHEDULER_POLL_SECONDS * 2
     }
     
     scheduler = BackgroundScheduler(
@@ -41,8 +120,16 @@ def init_scheduler(app):
         timezone='Europe/Stockholm'  # Swedish timezone
     )
     
-    scheduler.start()
-    print("Scheduler started")
+    if _acquire_scheduler_lock():
+        scheduler.start()
+        _start_polling(scheduler)
+        print("Scheduler started")
+    else:
+        scheduler.start(paused=True)
+        threading.Thread(
+            target=_retry_scheduler_lock, args=(scheduler,), name='scheduler-lock', daemon=True
+        ).start()
+        print("Scheduler started paused (jobs run in another process)")
     
     return scheduler
 
@@ -50,6 +137,7 @@ def init_scheduler(app):
 def shutdown_scheduler():
     """Gracefully shutdown the scheduler"""
     global scheduler
+    _scheduler_stopping.set()
     if scheduler:
         scheduler.shutdown(wait=False)
         print("Scheduler stopped")
@@ -92,6 +180,38 @@ def schedule_publish(upload_id: int, scheduled_time: datetime, app_context):
     return job_id
 
 
+def enqueue_job(func, args: list, job_id: str) -> str:
+    """
+    Run a job on the scheduler's thread pool as soon as possible.
+    
+    Used to move long-running work (e.g. publishing) off the request thread.
+    
+    Args:
+        func: Module-level function to run (referenced by import path)
+        args: Positional arguments for func
+        job_id: Unique job ID; an already queued job with this ID is replaced
+    
+    Returns:
+        The job ID
+    """
+    global scheduler
+    
+    if not scheduler:
+        raise RuntimeError("Scheduler not initialized")
+    
+    # A date trigger without run_date fires immediately
+    scheduler.add_job(
+        func=func,
+        trigger='date',
+        args=args,
+        id=job_id,
+        name=job_id,
+        replace_existing=True
+    )
+    
+    return job_id
+
+
 def cancel_scheduled_publish(upload_id: int) -> bool:
     """
     Cancel a scheduled publish.
@@ -127,10 +247,11 @@ def execute_publish(upload_id: int, app):
         app: Flask app for context
     """
     with app.app_context():
-        from models import db, Upload, Listing, EtsyToken
-        from etsy_api import publish_listing, decrypt_token, refresh_access_token, encrypt_token
+        from models import db, Upload, Listing
+        from etsy_api import publish_listing
+        from etsy_tokens import ensure_fresh_access_token
         
-        upload = Upload.query.get(upload_id)
+        upload = db.session.get(Upload, upload_id)
         if not upload:
             print(f"Upload {upload_id} not found")
             return
@@ -139,29 +260,14 @@ def execute_publish(upload_id: int, app):
             print(f"Upload {upload_id} is not scheduled (status: {upload.status})")
             return
         
-        # Get user's Etsy token
-        etsy_token = EtsyToken.query.filter_by(user_id=upload.user_id).first()
-        if not etsy_token:
-            upload.status = 'failed'
-            upload.error_message = 'Etsy not connected'
-            db.session.commit()
-            return
-        
         try:
-            # Decrypt access token
-            access_token = decrypt_token(etsy_token.access_token_encrypted)
-            
-            # Check if token needs refresh
-            if etsy_token.expires_at and etsy_token.expires_at <= datetime.utcnow():
-                refresh_token = decrypt_token(etsy_token.refresh_token_encrypted)
-                new_tokens = refresh_access_token(refresh_token)
-                
-                etsy_token.access_token_encrypted = encrypt_token(new_tokens['access_token'])
-                etsy_token.refresh_token_encrypted = encrypt_token(new_tokens['refresh_token'])
-                etsy_token.expires_at = datetime.utcnow() + timedelta(seconds=new_tokens['expires_in'])
-                
-                access_token = new_tokens['access_token']
+            # Get user's Etsy token, refreshing it if expired
+            access_token, shop_id = ensure_fresh_access_token(upload.user_id)
+            if not access_token:
+                upload.status = 'failed'
+                upload.error_message = 'Etsy not connected'
                 db.session.commit()
+                return
             
             # Update upload status
             upload.status = 'uploading'
@@ -174,7 +280,7 @@ def execute_publish(upload_id: int, app):
             for listing in upload.listings:
                 if listing.etsy_listing_id and listing.status == 'uploaded':
                     try:
-                        publish_listing(access_token, etsy_token.shop_id, listing.etsy_listing_id)
+                        publish_listing(access_token, shop_id, listing.etsy_listing_id)
                         listing.status = 'published'
                         listing.etsy_url = f"https://www.etsy.com/listing/{listing.etsy_listing_id}"
                         published_count += 1
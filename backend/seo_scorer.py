@@ -11,9 +11,11 @@ Scoring Factors:
 - Keyword Consistency (20%): Cross-field optimization
 """
 
+import copy
 import re
 from collections import Counter
 from datetime import datetime
+from functools import lru_cache
 
 # =============================================================================
 # ETSY HIGH-VALUE KEYWORDS DATABASE
@@ -85,11 +87,22 @@ SPAM_WORDS = {
     'limited time', 'sale', 'discount', 'cheap', 'free', 'bargain'
 }
 
+# Precompiled description patterns
+SECTION_HEADER_PATTERN = re.compile(r'[A-Z]{4,}:')
+EMOJI_HEADER_PATTERN = re.compile(r'[🎁📦💡✨⭐🔥📩][A-Z\s]+:')
+EMOJI_PATTERN = re.compile(r'[\U0001F300-\U0001F9FF\U00002600-\U000027BF]')
+
+# Number of distinct (title, description, tags) scores kept in memory
+SEO_SCORE_CACHE_SIZE = 2048
+
 
 def calculate_seo_score(title: str, description: str, tags: list) -> dict:
     """
     Calculate comprehensive SEO score for an Etsy listing.
     
+    Results are cached per (title, description, tags) and month; each
+    caller gets its own copy of the cached dict.
+    
     Args:
         title: Listing title (max 140 chars)
         description: Listing description
@@ -98,6 +111,15 @@ def calculate_seo_score(title: str, description: str, tags: list) -> dict:
     Returns:
         Dictionary with overall score, breakdown, tips, and grade
     """
+    # Seasonal tips depend on the month, so it is part of the cache key
+    result = _calculate_seo_score(title, description, tuple(tags or ()), datetime.now().month)
+    return copy.deepcopy(result)
+
+
+@lru_cache(maxsize=SEO_SCORE_CACHE_SIZE)
+def _calculate_seo_score(title: str, description: str, tags: tuple, month: int) -> dict:
+    """Uncached scoring behind calculate_seo_score."""
+    tags = list(tags)
     scores = {
         'title_score': calculate_title_score(title),
         'description_score': calculate_description_score(description),
@@ -257,7 +279,7 @@ def calculate_description_score(description: str) -> int:
         structure_score += 8
     
     # Section headers (ALL CAPS or emoji headers)
-    if re.search(r'[A-Z]{4,}:', description) or re.search(r'[🎁📦💡✨⭐🔥📩][A-Z\s]+:', description):
+    if SECTION_HEADER_PATTERN.search(description) or EMOJI_HEADER_PATTERN.search(description):
         structure_score += 6
     
     # Line breaks for readability
@@ -270,8 +292,7 @@ def calculate_description_score(description: str) -> int:
     score += min(structure_score, 20)
     
     # 4. Emoji engagement (10 points max)
-    emoji_pattern = re.compile(r'[\U0001F300-\U0001F9FF\U00002600-\U000027BF]')
-    emoji_count = len(emoji_pattern.findall(description))
+    emoji_count = len(EMOJI_PATTERN.findall(description))
     if 3 <= emoji_count <= 15:
         score += 10  # Good balance
     elif emoji_count > 0:
@@ -0,0 +1,105 @@
+"""
+Shared pytest setup for the backend tests
+
+Run from the backend directory with: python -m pytest
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+# The backend modules import each other as top-level modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# app.py builds the app at import time, so configure it before anything imports it
+os.environ['DATABASE_URL'] = 'sqlite:///:memory:'
+os.environ['FLASK_ENV'] = 'testing'
+os.environ.setdefault('FERNET_KEY', 'Wm9lN0V4YW1wbGVLZXlGb3JUZXN0c09ubHkxMjM0NTY=')
+
+
+@pytest.fixture
+def app():
+    """The Flask app with empty tables and empty in-process caches"""
+    import app as app_module
+    import etsy_tokens
+    from models import db
+
+    flask_app = app_module.app
+
+    with flask_app.app_context():
+        db.drop_all()
+        db.create_all()
+
+    etsy_tokens._etsy_token_cache.clear()
+    app_module._shop_data_cache.clear()
+    app_module._taxonomy_cache.clear()
+    flask_app.pkce_verifiers.clear()
+
+    with flask_app.app_context():
+        yield flask_app
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def user(app):
+    from models import db, User
+
+    user = User(email='seller@example.com')
+    user.set_password('secret')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def auth_headers(app, user):
+    from flask_jwt_extended import create_access_token
+
+    return {'Authorization': f'Bearer {create_access_token(identity=user.id)}'}
+
+
+@pytest.fixture
+def etsy_token(app, user):
+    """A connected Etsy shop whose access token is still valid"""
+    from etsy_api import encrypt_token
+    from models import db, EtsyToken
+
+    token = EtsyToken(
+        user_id=user.id,
+        access_token_encrypted=encrypt_token('access-1'),
+        refresh_token_encrypted=encrypt_token('refresh-1'),
+        expires_at=datetime.utcnow() + timedelta(hours=1),
+        shop_id='12345',
+        shop_name='Test Shop'
+    )
+    db.session.add(token)
+    db.session.commit()
+    return token
+
+
+@pytest.fixture
+def upload(app, user):
+    """A draft upload with two listings"""
+    from models import db, Upload, Listing
+
+    upload = Upload(user_id=user.id, title='2 produkter', status='draft')
+    db.session.add(upload)
+    db.session.flush()
+    for index in range(2):
+        db.session.add(Listing(
+            upload_id=upload.id,
+            title=f'Listing {index}',
+            description='Description',
+            tags=['tag'],
+            price=9.99,
+            quantity=10
+        ))
+    db.session.commit()
+    return upload
@@ -0,0 +1,105 @@
+"""
+Tests for the Groq listing generator
+"""
+
+import asyncio
+import base64
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('groq')
+
+from PIL import Image
+
+import ai_generator
+
+
+class FakeCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, **request):
+        self.calls += 1
+        listing = {'title': 'Handmade ceramic mug', 'description': 'A mug', 'tags': ['mug']}
+        message = SimpleNamespace(content=json.dumps({'listings': [listing]}))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    completions = FakeCompletions()
+    monkeypatch.setattr(ai_generator, 'client', SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+    monkeypatch.setattr(ai_generator, '_listing_cache_get', lambda key: None)
+    monkeypatch.setattr(ai_generator, '_listing_cache_set', lambda key, result: None)
+    return completions
+
+
+def _image_bytes():
+    buffer = io.BytesIO()
+    Image.new('RGB', (8, 8), 'white').save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+
+def test_single_listing_uses_sync_client_inside_running_loop(fake_client):
+    async def caller():
+        # A sync caller on an event loop thread must not hit asyncio.run()
+        return ai_generator.generate_listing_content(_image_bytes(), folder_name='mug')
+
+    result = asyncio.run(caller())
+
+    assert fake_client.calls == 1
+    assert result['title'] == 'Handmade ceramic mug'
+
+
+def test_batches_fan_out_on_private_loop(fake_client, monkeypatch):
+    class FakeAsyncCompletions:
+        async def create(self, **request):
+            return fake_client.create(**request)
+
+    fake_async = SimpleNamespace(chat=SimpleNamespace(completions=FakeAsyncCompletions()))
+    monkeypatch.setattr(ai_generator, '_get_async_client', lambda: fake_async)
+    monkeypatch.setattr(ai_generator, '_pack_batches', lambda items: [[item] for item in items])
+
+    items = [{'image_data': _image_bytes(), 'folder_name': f'mug {i}'} for i in range(3)]
+    results = ai_generator.generate_listing_content_batch(items)
+
+    assert fake_client.calls == 3
+    assert [result['title'] for result in results] == ['Handmade ceramic mug'] * 3
+
+
+def test_seasonal_keywords_are_a_fresh_list():
+    keywords = ai_generator.suggest_seasonal_keywords(12)
+    keywords.append('mutated')
+
+    assert isinstance(keywords, list)
+    assert 'mutated' not in ai_generator.suggest_seasonal_keywords(12)
+    assert isinstance(ai_generator.suggest_seasonal_keywords(13), list)
+
+
+def test_base64_blob_is_told_apart_from_file_paths(tmp_path, monkeypatch):
+    tiny_png = base64.b64encode(_image_bytes()).decode()
+    one_pixel_png = (
+        'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=='
+    )
+    # A relative path without an extension is all base64 alphabet
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'photos').mkdir()
+    (tmp_path / 'photos' / 'mug').write_bytes(_image_bytes())
+
+    assert ai_generator._is_base64_blob(one_pixel_png)
+    assert ai_generator._is_base64_blob(tiny_png)
+    assert not ai_generator._is_base64_blob(str(tmp_path / 'mug.jpg'))
+    assert not ai_generator._is_base64_blob('photos/mug.png')
+    assert not ai_generator._is_base64_blob('photos/mug')
+
+
+def test_truncated_batch_response_keeps_complete_listings():
+    content = '{"listings": [{"title": "Mug", "tags": ["a", "b"]}, {"title": "Bowl"}, {"title": "Pla'
+
+    assert ai_generator._parse_batch_response(content, 3) == [
+        {'title': 'Mug', 'tags': ['a', 'b']}, {'title': 'Bowl'}, None
+    ]
+    assert ai_generator._parse_batch_response('not json at all', 2) == [None, None]
@@ -0,0 +1,45 @@
+"""
+Tests for the Etsy API compliance helpers
+"""
+
+import json
+import logging
+import threading
+import time
+
+from api_compliance import get_compliance_status, log_security_event, notify_data_breach
+
+
+def test_notify_data_breach_result_is_json_serializable():
+    result = notify_data_breach({
+        'description': 'Leaked database backup',
+        'affected_users': 1,
+        'data_types': 'email',
+        'discovered_at': '2024-01-01T00:00:00+00:00'
+    })
+
+    assert json.loads(json.dumps(result))['deadline'] == result['deadline']
+
+
+def test_compliance_status_is_not_shared_between_callers():
+    first = get_compliance_status()
+    first['rate_limiting']['enabled'] = False
+    second = get_compliance_status()
+
+    assert second['rate_limiting']['enabled'] is True
+
+
+def test_security_events_are_flushed_as_one_record_by_one_thread(caplog):
+    threads_before = threading.active_count()
+
+    with caplog.at_level(logging.WARNING):
+        for index in range(3):
+            log_security_event('login_failed', attempt=index)
+        assert threading.active_count() == threads_before
+
+        deadline = time.monotonic() + 2
+        while not caplog.records and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    assert [record.getMessage()[:20] for record in caplog.records] == ['SECURITY EVENTS (3):']
+    assert threading.active_count() == threads_before
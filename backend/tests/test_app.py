@@ -0,0 +1,74 @@
+"""
+Tests for app setup: schema migrations, PKCE verifiers and listing search
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import inspect, text
+
+import app as app_module
+from models import db, EtsyListing
+
+
+def test_migrate_database_adds_missing_columns_once(app, monkeypatch):
+    with db.engine.begin() as conn:
+        conn.execute(text('ALTER TABLE listings DROP COLUMN taxonomy_id'))
+        conn.execute(text("DELETE FROM schema_meta WHERE key = 'schema_version'"))
+
+    app_module.migrate_database(app)
+
+    columns = {col['name'] for col in inspect(db.engine).get_columns('listings')}
+    assert 'taxonomy_id' in columns
+    with db.engine.connect() as conn:
+        version = conn.execute(text("SELECT value FROM schema_meta WHERE key = 'schema_version'")).scalar()
+    assert version == str(app_module.SCHEMA_VERSION)
+
+    # With the version recorded, the second run skips schema reflection
+    monkeypatch.setattr(app_module, 'inspect', lambda *args: pytest.fail('schema was reflected again'))
+    app_module.migrate_database(app)
+
+
+def test_pkce_verifier_is_single_use(app):
+    app_module.store_pkce_verifier('state-1', 'verifier-1')
+
+    assert app_module.pop_pkce_verifier('state-1') == 'verifier-1'
+    assert app_module.pop_pkce_verifier('state-1') is None
+
+
+def test_pkce_verifiers_expire_and_are_pruned(app, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(app_module.time, 'monotonic', lambda: now[0])
+    app_module.store_pkce_verifier('old', 'verifier-old')
+
+    now[0] += app_module.PKCE_VERIFIER_TTL + 1
+    assert app_module.pop_pkce_verifier('old') is None
+
+    app_module.store_pkce_verifier('old', 'verifier-old')
+    now[0] += app_module.PKCE_VERIFIER_TTL + 1
+    app_module.store_pkce_verifier('new', 'verifier-new')
+    assert list(app.pkce_verifiers) == ['new']
+
+
+def test_pkce_verifiers_are_capped(app, monkeypatch):
+    monkeypatch.setattr(app_module, 'PKCE_VERIFIER_MAX_ENTRIES', 3)
+    for index in range(5):
+        app_module.store_pkce_verifier(f'state-{index}', f'verifier-{index}')
+
+    assert list(app.pkce_verifiers) == ['state-2', 'state-3', 'state-4']
+
+
+def test_listing_search_matches_wildcards_literally(client, auth_headers, user):
+    for index, title in enumerate(['100% wool scarf', '100 wool scarf', 'snake_case mug', 'snakeXcase mug']):
+        db.session.add(EtsyListing(
+            user_id=user.id, etsy_listing_id=str(index), title=title,
+            state='active', synced_at=datetime.utcnow()
+        ))
+    db.session.commit()
+
+    def search(term):
+        response = client.get('/api/shop/listings', query_string={'search': term}, headers=auth_headers)
+        return sorted(listing['title'] for listing in response.get_json()['listings'])
+
+    assert search('100%') == ['100% wool scarf']
+    assert search('snake_case') == ['snake_case mug']
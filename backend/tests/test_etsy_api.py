@@ -0,0 +1,66 @@
+"""Tests for the Etsy API client helpers"""
+
+import io
+import re
+
+import requests
+
+import etsy_api
+from etsy_api import MultipartFileBody
+
+
+def _requests_body(fields, file_field, filename, data, content_type):
+    """The multipart body requests builds with files=, and its boundary"""
+    prepared = requests.Request(
+        'POST', 'https://openapi.etsy.com/upload',
+        files={file_field: (filename, data, content_type)},
+        data=fields
+    ).prepare()
+    boundary = re.search(r'boundary=(\S+)', prepared.headers['Content-Type']).group(1)
+    return prepared.body, boundary
+
+
+def test_multipart_body_matches_requests():
+    fields = {'rank': 2, 'alt_text': 'Blue mug'}
+    data = b'\xff\xd8' + b'x' * 200_000
+    expected, boundary = _requests_body(fields, 'image', 'mug.jpg', data, 'image/jpeg')
+    
+    body = MultipartFileBody(fields, 'image', 'mug.jpg', io.BytesIO(data), 'image/jpeg', boundary=boundary)
+    
+    assert len(body) == len(expected)
+    assert body.read() == expected
+    assert body.content_type == f'multipart/form-data; boundary={boundary}'
+
+
+def test_multipart_body_iterates_in_chunks():
+    data = b'v' * (MultipartFileBody.CHUNK_SIZE * 3 + 17)
+    expected, boundary = _requests_body({}, 'video', 'clip.mp4', data, 'video/mp4')
+    
+    body = MultipartFileBody({}, 'video', 'clip.mp4', io.BytesIO(data), 'video/mp4', boundary=boundary)
+    chunks = list(body)
+    
+    assert b''.join(chunks) == expected
+    assert all(len(chunk) <= MultipartFileBody.CHUNK_SIZE for chunk in chunks)
+
+
+def test_multipart_body_escapes_filename():
+    filename = 'a"; name="x.mp4\r\nX-Evil: 1'
+    expected, boundary = _requests_body({}, 'video', filename, b'data', 'video/mp4')
+    
+    body = MultipartFileBody({}, 'video', filename, io.BytesIO(b'data'), 'video/mp4', boundary=boundary)
+    content = body.read()
+    
+    assert content == expected
+    assert b'\r\nX-Evil' not in content
+    assert b'filename="a%22; name=%22x.mp4%0D%0AX-Evil: 1"' in content
+    # Only the field name itself sets name=, the filename cannot add another
+    assert content.count(b' name="') == 1
+
+
+def test_session_retries_only_idempotent_methods_without_raising():
+    retry = etsy_api._session.get_adapter('https://openapi.etsy.com').max_retries
+
+    assert not retry.raise_on_status
+    assert 'GET' in retry.allowed_methods
+    assert 'POST' not in retry.allowed_methods
+    assert 'PATCH' not in retry.allowed_methods
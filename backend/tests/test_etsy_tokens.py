@@ -0,0 +1,51 @@
+"""
+Tests for the Etsy token cache and refresh helpers
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import etsy_tokens
+from etsy_api import decrypt_token
+from models import db, EtsyToken
+
+
+def _expire(token):
+    token.expires_at = datetime.utcnow() - timedelta(minutes=1)
+    db.session.commit()
+
+
+def _fake_refresh(calls):
+    def refresh_access_token(refresh_token):
+        calls.append(refresh_token)
+        time.sleep(0.05)
+        return {'access_token': 'access-2', 'refresh_token': 'refresh-2', 'expires_in': 3600}
+    return refresh_access_token
+
+
+def test_concurrent_callers_refresh_expired_token_once(app, etsy_token, monkeypatch):
+    _expire(etsy_token)
+    calls = []
+    monkeypatch.setattr(etsy_tokens, 'refresh_access_token', _fake_refresh(calls))
+    user_id = etsy_token.user_id
+    results = []
+
+    def worker():
+        with app.app_context():
+            results.append(etsy_tokens.ensure_fresh_access_token(user_id))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ['refresh-1']
+    assert results == [('access-2', '12345')] * 4
+    db.session.expire_all()
+    assert decrypt_token(db.session.get(EtsyToken, etsy_token.id).refresh_token_encrypted) == 'refresh-2'
+
+
+def test_refresh_lock_table_is_bounded():
+    assert len(etsy_tokens._etsy_refresh_locks) == etsy_tokens.ETSY_REFRESH_LOCK_STRIPES
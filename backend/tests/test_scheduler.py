@@ -0,0 +1,78 @@
+"""
+Tests for the scheduled publish job
+"""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.base import STATE_PAUSED, STATE_RUNNING
+
+import etsy_api
+import etsy_tokens
+import scheduler
+from models import db, Upload
+from scheduler import execute_publish
+
+
+def test_scheduled_publish_refreshes_through_shared_helper(app, etsy_token, upload, monkeypatch):
+    etsy_token.expires_at = datetime.utcnow() - timedelta(minutes=1)
+    upload.status = 'scheduled'
+    for index, listing in enumerate(upload.listings):
+        listing.etsy_listing_id = str(1000 + index)
+        listing.status = 'uploaded'
+    db.session.commit()
+
+    refreshes = []
+    published = []
+    monkeypatch.setattr(etsy_tokens, 'refresh_access_token', lambda token: refreshes.append(token) or {
+        'access_token': 'access-2', 'refresh_token': 'refresh-2', 'expires_in': 3600
+    })
+    monkeypatch.setattr(etsy_api, 'publish_listing', lambda *args: published.append(args))
+
+    execute_publish(upload.id, app)
+
+    assert refreshes == ['refresh-1']
+    assert published == [('access-2', '12345', '1000'), ('access-2', '12345', '1001')]
+    assert etsy_tokens.get_etsy_context(etsy_token.user_id) == ('access-2', '12345')
+    db.session.expire_all()
+    assert db.session.get(Upload, upload.id).status == 'published'
+
+
+def test_testing_config_does_not_start_scheduler(app):
+    assert app.config['TESTING']
+    assert scheduler.scheduler is None
+
+
+def test_paused_process_takes_over_when_lock_holder_exits(tmp_path, monkeypatch):
+    fcntl = pytest.importorskip('fcntl')
+    lock_path = str(tmp_path / 'scheduler.lock')
+    monkeypatch.setattr(scheduler, 'SCHEDULER_LOCK_PATH', lock_path)
+    monkeypatch.setattr(scheduler, 'SCHEDULER_POLL_SECONDS', 0.05)
+    monkeypatch.setattr(scheduler, '_scheduler_lock_file', None)
+
+    # Another worker holds the lock
+    holder = open(lock_path, 'w')
+    fcntl.flock(holder, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    sched = BackgroundScheduler(jobstores={'local': MemoryJobStore()})
+    sched.start(paused=True)
+    retry = threading.Thread(target=scheduler._retry_scheduler_lock, args=(sched,), daemon=True)
+    retry.start()
+    try:
+        retry.join(0.2)
+        assert retry.is_alive()
+        assert sched.state == STATE_PAUSED
+
+        holder.close()
+        retry.join(2)
+
+        assert not retry.is_alive()
+        assert sched.state == STATE_RUNNING
+        assert sched.get_job('poll_job_store')
+    finally:
+        sched.shutdown(wait=False)
+        if scheduler._scheduler_lock_file:
+            scheduler._scheduler_lock_file.close()
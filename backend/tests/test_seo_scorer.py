@@ -0,0 +1,17 @@
+"""
+Tests for the listing SEO scorer
+"""
+
+from seo_scorer import calculate_seo_score
+
+
+def test_cached_score_is_not_shared_between_callers():
+    args = ('Handmade ceramic mug', 'A handmade mug for coffee lovers', ['mug', 'ceramic'])
+
+    first = calculate_seo_score(*args)
+    first['tips'].append('mutated')
+    first['overall_score'] = -1
+    second = calculate_seo_score(*args)
+
+    assert 'mutated' not in second['tips']
+    assert second['overall_score'] != -1
@@ -0,0 +1,155 @@
+"""
+Tests for the upload, publish and media routes
+"""
+
+import io
+import itertools
+import threading
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+import app as app_module
+from models import db, Listing, Upload, User
+
+
+def test_background_publish_without_scheduler_returns_503(client, auth_headers, etsy_token, upload):
+    # The testing config never starts the scheduler, so enqueue_job has nothing to use
+    response = client.post(f'/api/uploads/{upload.id}/publish?background=1', headers=auth_headers)
+
+    assert response.status_code == 503
+    db.session.expire_all()
+    assert db.session.get(Upload, upload.id).status == 'draft'
+
+
+def _upload_payload():
+    return {'listings': [
+        {'title': 'Mug', 'description': 'A mug', 'tags': ['mug'], 'price': 12.5},
+        {'title': 'Bowl', 'price': 20}
+    ]}
+
+
+def test_create_upload_inserts_listings(client, auth_headers, etsy_token):
+    response = client.post('/api/uploads', json=_upload_payload(), headers=auth_headers)
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body['status'] == 'draft'
+    assert [listing['title'] for listing in body['listings']] == ['Mug', 'Bowl']
+    assert body['listings'][1]['quantity'] == 999
+
+
+def test_create_upload_requires_etsy_connection(client, auth_headers):
+    response = client.post('/api/uploads', json=_upload_payload(), headers=auth_headers)
+
+    assert response.status_code == 400
+
+
+def test_create_upload_does_not_decrypt_token(client, auth_headers, etsy_token):
+    # A token encrypted under a rotated key must not turn this into a 500
+    etsy_token.access_token_encrypted = b'not a fernet token'
+    db.session.commit()
+
+    response = client.post('/api/uploads', json=_upload_payload(), headers=auth_headers)
+
+    assert response.status_code == 201
+
+
+def test_publish_creates_drafts_on_worker_threads(client, auth_headers, etsy_token, upload, monkeypatch):
+    listing_ids = itertools.count(5000)
+    threads = set()
+
+    def create_draft_listing(access_token, shop_id, listing_data):
+        threads.add(threading.get_ident())
+        if listing_data['title'] == 'Listing 1':
+            raise Exception('Etsy rejected the listing')
+        return {'listing_id': next(listing_ids)}
+
+    monkeypatch.setattr(app_module, 'create_draft_listing', create_draft_listing)
+
+    response = client.post(f'/api/uploads/{upload.id}/publish', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert threading.get_ident() not in threads
+    db.session.expire_all()
+    published = db.session.get(Upload, upload.id)
+    assert published.status == 'published'
+    assert published.error_message == '1 listings failed'
+    by_title = {listing.title: listing for listing in published.listings}
+    assert (by_title['Listing 0'].status, by_title['Listing 0'].etsy_listing_id) == ('uploaded', '5000')
+    assert by_title['Listing 1'].status == 'failed'
+
+
+def test_background_publish_runs_queued_job(client, auth_headers, etsy_token, upload, monkeypatch):
+    queued = []
+    monkeypatch.setattr(app_module, 'enqueue_job', lambda func, args, job_id: queued.append((func, args)))
+    monkeypatch.setattr(app_module, 'create_draft_listing', lambda *args: {'listing_id': 42})
+
+    response = client.post(f'/api/uploads/{upload.id}/publish?background=1', headers=auth_headers)
+
+    assert response.status_code == 202
+    assert response.get_json()['status'] == 'queued'
+
+    func, args = queued[0]
+    func(*args)
+    db.session.expire_all()
+    assert db.session.get(Upload, upload.id).status == 'published'
+
+
+def _published_listing(upload):
+    listing = upload.listings[0]
+    listing.etsy_listing_id = '777'
+    listing.status = 'uploaded'
+    db.session.commit()
+    return listing
+
+
+def test_video_upload_streams_file_to_etsy(client, auth_headers, etsy_token, upload, monkeypatch):
+    listing = _published_listing(upload)
+    sent = {}
+
+    def upload_listing_video(access_token, shop_id, listing_id, video, filename):
+        sent.update(listing_id=listing_id, data=video.read(), filename=filename)
+        return {'video_id': 9}
+
+    monkeypatch.setattr(app_module, 'upload_listing_video', upload_listing_video)
+
+    response = client.post(
+        f'/api/uploads/{upload.id}/listings/{listing.id}/videos',
+        data={'video': (io.BytesIO(b'video bytes'), 'clip.mp4')},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    assert sent == {'listing_id': '777', 'data': b'video bytes', 'filename': 'clip.mp4'}
+    db.session.expire_all()
+    assert [video['etsy_video_id'] for video in db.session.get(Listing, listing.id).videos] == [9]
+
+
+def test_video_upload_rejects_oversized_body_before_parsing(client, auth_headers, etsy_token, upload, monkeypatch):
+    listing = _published_listing(upload)
+    monkeypatch.setattr(app_module, 'VIDEO_MAX_BYTES', 1)
+    monkeypatch.setattr(app_module, 'upload_listing_video', lambda *args: pytest.fail('upload was attempted'))
+
+    response = client.post(
+        f'/api/uploads/{upload.id}/listings/{listing.id}/videos',
+        data={'video': (io.BytesIO(b'x' * (app_module.MULTIPART_OVERHEAD_BYTES + 10)), 'clip.mp4')},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 413
+
+
+def test_media_upload_checks_upload_ownership(client, auth_headers, upload):
+    other = User(email='other@example.com')
+    other.set_password('secret')
+    db.session.add(other)
+    db.session.commit()
+    other_headers = {'Authorization': f'Bearer {create_access_token(identity=other.id)}'}
+    listing_id = upload.listings[0].id
+
+    response = client.post(f'/api/uploads/{upload.id}/listings/{listing_id}/images', headers=other_headers)
+    assert (response.status_code, response.get_json()['error']) == (404, 'Upload not found')
+
+    response = client.post(f'/api/uploads/{upload.id}/listings/9999/images', headers=auth_headers)
+    assert (response.status_code, response.get_json()['error']) == (404, 'Listing not found')